@@ -0,0 +1 @@
+"""Benchmarks für Agent Fabric und generierte Agenten."""
@@ -0,0 +1,185 @@
+"""
+Benchmark für Agent Fabric gegen einen lokalen Mock-LLM
+
+Misst `AgentGenerator.generate_agent` (sequenziell), `agenerate_agent`
+(parallel), das reine Template-Rendering und den A2A-Server eines
+generierten Agents. Ergebnis ist JSON zum Vergleich zwischen Commits.
+
+    python -m benchmarks.bench_generation --requests 50 --concurrency 8 \\
+        --latency 0.2 --tokens-per-second 100 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.mock_llm import MockLLMServer
+from benchmarks.utils import (
+    ThreadedServer,
+    a2a_call,
+    environment_info,
+    load_agent_module,
+    peak_rss_mb,
+    rss_mb,
+    run_load,
+    summarize,
+)
+
+
+def bench_generate_sequential(generator, llm: dict, requests: int) -> dict:
+    """Synchrone Generierung, eine Anfrage nach der anderen."""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t = time.perf_counter()
+        generator.generate_agent(
+            f"Benchmark-Agent {i}: fasse Texte zusammen",
+            force_regenerate=True,
+            **llm,
+        )
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_generate_concurrent(
+    generator, llm: dict, requests: int, concurrency: int
+) -> dict:
+    """Asynchrone Generierung mit begrenzter Parallelität."""
+
+    async def call(i: int):
+        await generator.agenerate_agent(
+            f"Benchmark-Agent {i}: übersetze Texte",
+            force_regenerate=True,
+            **llm,
+        )
+
+    return asyncio.run(run_load(call, requests, concurrency))
+
+
+def bench_render(generator, llm: dict, requests: int) -> dict:
+    """Nur Template-Rendering (Hot Path ohne LLM)."""
+    from generator import AgentSettings
+
+    settings = AgentSettings(
+        llm_endpoint=llm["llm_endpoint"],
+        llm_model=llm["llm_model"],
+        filename="bench_agent.py",
+    )
+    latencies = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t = time.perf_counter()
+        generator._render_agent(
+            f"Benchmark-Agent {i}",
+            "Du bist ein Benchmark-Agent.",
+            settings,
+            llm["llm_api_key"],
+        )
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_a2a(agent_path: Path, requests: int, concurrency: int) -> dict:
+    """Sequenzielle und parallele Last auf den A2A-Server eines Agents."""
+    import httpx
+    from fasta2a.client import A2AClient
+
+    module = load_agent_module(agent_path)
+    results = {}
+
+    with ThreadedServer(module.app) as server:
+
+        async def drive(parallel: int) -> dict:
+            async with httpx.AsyncClient(timeout=120) as http_client:
+                client = A2AClient(server.url, http_client=http_client)
+
+                async def call(i: int):
+                    await a2a_call(client, f"Benchmark-Anfrage {i}")
+
+                return await run_load(call, requests, parallel)
+
+        results["a2a_sequential"] = asyncio.run(drive(1))
+        results["a2a_concurrent"] = asyncio.run(drive(concurrency))
+
+    return results
+
+
+def main():
+    """Führe alle Szenarien aus und gib das Ergebnis als JSON aus."""
+    parser = argparse.ArgumentParser(description="Agent Fabric Benchmark")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--response-tokens", type=int, default=64)
+    parser.add_argument(
+        "--skip-a2a", action="store_true", help="A2A-Szenarien überspringen"
+    )
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args()
+
+    from generator import AgentGenerator, AgentSettings
+    from prompt_cache import PromptCache
+
+    report = {
+        "environment": environment_info(),
+        "config": vars(args),
+        "scenarios": {},
+    }
+
+    with MockLLMServer(
+        args.latency, args.tokens_per_second, args.response_tokens
+    ) as mock:
+        llm = {
+            "llm_endpoint": mock.base_url,
+            "llm_api_key": "sk-bench",
+            "llm_model": "mock",
+        }
+        # Ohne Disk-Cache, damit jede Anfrage das LLM erreicht
+        generator = AgentGenerator(prompt_cache=PromptCache(path=None))
+        scenarios = report["scenarios"]
+
+        scenarios["render"] = bench_render(generator, llm, args.requests)
+        scenarios["generate_sequential"] = bench_generate_sequential(
+            generator, llm, args.requests
+        )
+        scenarios["generate_concurrent"] = bench_generate_concurrent(
+            generator, llm, args.requests, args.concurrency
+        )
+
+        if not args.skip_a2a:
+            with tempfile.TemporaryDirectory() as tmp:
+                agent_path = Path(tmp) / "bench_agent.py"
+                agent_path.write_text(
+                    generator._render_agent(
+                        "Benchmark-Agent",
+                        "Du bist ein Benchmark-Agent.",
+                        AgentSettings(
+                            llm_endpoint=llm["llm_endpoint"],
+                            llm_model=llm["llm_model"],
+                            filename=agent_path.name,
+                        ),
+                        llm["llm_api_key"],
+                    ),
+                    encoding="utf-8",
+                )
+                scenarios.update(bench_a2a(agent_path, args.requests, args.concurrency))
+
+        generator.close()
+
+    report["memory"] = {"rss_mb": rss_mb(), "peak_rss_mb": peak_rss_mb()}
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Ergebnis: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Startzeit-Benchmark für Agent Fabric und generierte Agenten
+
+Misst in frischen Prozessen die Importzeit (`python -X importtime`) von
+`main`/`generator` sowie generierter Agenten und die Zeit bis zum Ende eines
+interaktiven Starts, der sofort mit `exit` beendet wird.
+
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.utils import environment_info
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Lies `-X importtime`-Ausgabe als (Modul, self_us, cumulative_us)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        # Ein Leerzeichen trennt die Spalte; weitere Einrückung = verschachtelt
+        entries.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_import(module: str, cwd: Path, runs: int, top: int = 10) -> dict:
+    """Importzeit eines Moduls in frischen Interpretern (Median über `runs`)."""
+    totals, walls, slowest = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        )
+        walls.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Import von {module} fehlgeschlagen:\n{proc.stderr}")
+
+        entries = parse_importtime(proc.stderr)
+        # Oberste Ebene (ohne Einrückung) ergibt die Gesamtzeit
+        totals.append(sum(c for name, _, c in entries if not name.startswith(" ")))
+        for name, _, cumulative in entries:
+            name = name.strip()
+            slowest[name] = max(slowest.get(name, 0), cumulative)
+
+    return {
+        "import_ms": statistics.median(totals) / 1000,
+        "process_wall_ms": statistics.median(walls) * 1000,
+        "slowest_imports_ms": {
+            name: cumulative / 1000
+            for name, cumulative in sorted(slowest.items(), key=lambda i: -i[1])[:top]
+        },
+    }
+
+
+def measure_interactive(agent_path: Path, runs: int) -> dict:
+    """Wall-Zeit von `python agent.py` bis zum Ende nach sofortigem `exit`."""
+    walls = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, agent_path.name],
+            cwd=agent_path.parent,
+            input="exit\n",
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        walls.append(time.perf_counter() - started)
+    return {"process_wall_ms": statistics.median(walls) * 1000}
+
+
+def main():
+    """Miss alle Startzeiten und gib das Ergebnis als JSON aus."""
+    parser = argparse.ArgumentParser(description="Agent Fabric Startzeit-Benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    args = parser.parse_args()
+
+    from generator import AGENT_TEMPLATES, AgentGenerator, AgentSettings
+    from prompt_cache import PromptCache
+
+    report = {
+        "environment": environment_info(),
+        "config": vars(args),
+        "scenarios": {},
+    }
+    scenarios = report["scenarios"]
+
+    scenarios["import_generator"] = measure_import("generator", ROOT, args.runs)
+    scenarios["import_main"] = measure_import("main", ROOT, args.runs)
+
+    generator = AgentGenerator(prompt_cache=PromptCache(path=None))
+    with tempfile.TemporaryDirectory() as tmp:
+        for template_name in AGENT_TEMPLATES:
+            if template_name == "mcp":
+                continue  # benötigt externe MCP-Pakete
+            agent_path = Path(tmp) / f"agent_{template_name}.py"
+            agent_path.write_text(
+                generator._render_agent(
+                    "Startzeit-Agent",
+                    "Du bist ein Startzeit-Agent.",
+                    AgentSettings(
+                        llm_endpoint="http://127.0.0.1:9/v1",
+                        llm_model="mock",
+                        filename=agent_path.name,
+                        template_name=template_name,
+                    ),
+                    "sk-bench",
+                ),
+                encoding="utf-8",
+            )
+            scenarios[f"import_agent_{template_name}"] = measure_import(
+                agent_path.stem, agent_path.parent, args.runs
+            )
+            if template_name != "server":
+                scenarios[f"interactive_agent_{template_name}"] = measure_interactive(
+                    agent_path, args.runs
+                )
+    generator.close()
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Ergebnis: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
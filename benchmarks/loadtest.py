@@ -0,0 +1,375 @@
+"""
+Lasttest für generierte Agent-Server mit Regressions-Gate
+
+Startet einen generierten Agent als eigenen Server-Prozess gegen den lokalen
+Mock-LLM und treibt ihn per A2A mit einstellbarer Parallelität und
+Anfrage-Mischung. Gemessen werden Durchsatz, Latenz-Perzentile, Fehlerrate
+und der Spitzen-Speicher (Peak RSS) des Agent-Prozesses. Mit `--baseline`
+wird gegen ein gespeichertes Ergebnis verglichen; Verschlechterungen über
+`--tolerance` führen zu Exit-Code 1.
+
+    python main.py loadtest mein_agent.py --concurrency 1,8,32 --requests 200
+    python -m benchmarks.loadtest --template standard --baseline loadtest_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROMPTS = {
+    "short": "Kurze Frage {i}: Was ist der wichtigste Punkt?",
+    "long": "Anfrage {i}: Bitte bearbeite den folgenden Text.\n\n"
+    + "Die Kundin beschreibt ausführlich ihr Anliegen zur letzten Bestellung. " * 40,
+    "repeat": "Immer dieselbe Anfrage: Bitte antworte kurz.",
+}
+
+DEFAULT_MIX = "short=3,long=1"
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Lies eine Mischung wie `short=3,long=1` (Gewichte je Anfragetyp)."""
+    mix = {}
+    for item in spec.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in PROMPTS:
+            raise ValueError(
+                f"Unbekannter Anfragetyp '{kind}' (verfügbar: {', '.join(PROMPTS)})"
+            )
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def build_prompts(mix: dict[str, float], requests: int, seed: int = 0) -> list:
+    """Deterministische Folge von (Typ, Text) gemäß der Mischung."""
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    return [(kind, PROMPTS[kind].format(i=i)) for i, kind in enumerate(kinds)]
+
+
+def free_port() -> int:
+    """Freier TCP-Port auf localhost."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(agent_path: Path, port: int) -> list[str]:
+    """Startbefehl für den Server-Modus der jeweiligen Agent-Variante."""
+    source = agent_path.read_text(encoding="utf-8")
+    if "def run_server" not in source:
+        raise ValueError(f"{agent_path.name} hat keinen Server-Modus (CLI-Variante?)")
+    args = ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    # Standard-Variante: `python agent.py server`, reine Server-Variante ohne Argument
+    if "def run_interactive" in source:
+        args = ["server", *args]
+    return [sys.executable, agent_path.name, *args]
+
+
+class AgentProcess:
+    """Generierter Agent als Server-Prozess, bis er Anfragen annimmt."""
+
+    def __init__(self, agent_path: Path, env: dict, startup_timeout: float = 60):
+        self.agent_path = agent_path
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = env
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    def start(self):
+        import httpx
+
+        self.process = subprocess.Popen(
+            server_command(self.agent_path, self.port),
+            cwd=self.agent_path.parent,
+            env=dict(os.environ, **self.env),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"Agent-Server beendet (Code {self.process.returncode}):\n"
+                    f"{self.process.stderr.read()}"
+                )
+            try:
+                if httpx.get(f"{self.url}/.well-known/agent.json").status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.stop()
+        raise TimeoutError("Agent-Server nicht rechtzeitig erreichbar")
+
+    def peak_rss_mb(self) -> float | None:
+        """Spitzen-RSS des laufenden Prozesses (Linux: VmHWM)."""
+        try:
+            with open(f"/proc/{self.process.pid}/status", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+async def drive(url: str, prompts: list, concurrency: int) -> dict:
+    """Sende alle Anfragen per A2A und fasse gesamt und je Typ zusammen."""
+    import httpx
+    from fasta2a.client import A2AClient
+
+    from benchmarks.utils import a2a_call, run_load, summarize
+
+    per_kind: dict[str, list[float]] = {}
+
+    async with httpx.AsyncClient(
+        timeout=300, limits=httpx.Limits(max_connections=concurrency + 4)
+    ) as http_client:
+        client = A2AClient(f"{url}/", http_client=http_client)
+
+        async def call(i: int):
+            kind, text = prompts[i]
+            started = time.perf_counter()
+            await a2a_call(client, text)
+            per_kind.setdefault(kind, []).append(time.perf_counter() - started)
+
+        result = await run_load(call, len(prompts), concurrency)
+
+    result["error_rate"] = result["errors"] / result["requests"] if prompts else 0.0
+    result["kinds"] = {
+        kind: summarize(latencies, result["wall_seconds"])
+        for kind, latencies in sorted(per_kind.items())
+    }
+    return result
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Verschlechterungen gegenüber der Baseline (leer = keine Regression)."""
+    regressions = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.0f} ms (vorher {before['p95_ms']:.0f} ms)"
+            )
+        if current["requests_per_second"] < before["requests_per_second"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: {current['requests_per_second']:.1f} req/s "
+                f"(vorher {before['requests_per_second']:.1f} req/s)"
+            )
+        if current["error_rate"] > before.get("error_rate", 0.0) + 0.01:
+            regressions.append(
+                f"{name}: Fehlerrate {current['error_rate']:.1%} "
+                f"(vorher {before.get('error_rate', 0.0):.1%})"
+            )
+
+    rss, rss_before = report.get("peak_rss_mb"), baseline.get("peak_rss_mb")
+    if rss and rss_before and rss > rss_before * (1 + tolerance):
+        regressions.append(f"Peak RSS {rss:.0f} MB (vorher {rss_before:.0f} MB)")
+    return regressions
+
+
+def render_agent(template_name: str, directory: Path) -> Path:
+    """Rendere einen Agent aus den aktuellen Templates (ohne LLM-Aufruf)."""
+    from generator import AgentGenerator, AgentSettings
+    from prompt_cache import PromptCache
+
+    generator = AgentGenerator(prompt_cache=PromptCache(path=None))
+    agent_path = directory / f"loadtest_{template_name}.py"
+    agent_path.write_text(
+        generator._render_agent(
+            "Lasttest-Agent",
+            "Du bist ein Lasttest-Agent. Antworte kurz.",
+            AgentSettings(
+                llm_endpoint="http://127.0.0.1:9/v1",
+                llm_model="mock",
+                filename=agent_path.name,
+                template_name=template_name,
+            ),
+            "sk-loadtest",
+        ),
+        encoding="utf-8",
+    )
+    return agent_path
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Optionen des Lasttests (auch für `python main.py loadtest`)."""
+    parser.add_argument(
+        "agent", nargs="?", help="Generierte Agent-Datei (sonst aus --template)"
+    )
+    parser.add_argument(
+        "--template",
+        default="standard",
+        help="Agent-Variante, die ohne Datei frisch gerendert wird",
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,8",
+        help="Parallelitätsstufen, kommagetrennt (je Stufe ein Szenario)",
+    )
+    parser.add_argument("--requests", type=int, default=50, help="Anfragen je Stufe")
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Anfrage-Mischung, Typen: {', '.join(PROMPTS)}",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--response-tokens", type=int, default=32)
+    parser.add_argument(
+        "--agent-env",
+        action="append",
+        default=[],
+        metavar="NAME=WERT",
+        help="Umgebungsvariable für den Agent, z.B. AGENT_MAX_IN_FLIGHT=32",
+    )
+    parser.add_argument("--output", help="JSON-Datei (Standard: stdout)")
+    parser.add_argument("--baseline", help="Gespeichertes Ergebnis zum Vergleich")
+    parser.add_argument(
+        "--save-baseline", help="Ergebnis zusätzlich als neue Baseline speichern"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Erlaubte relative Verschlechterung (0.25 = 25 %%)",
+    )
+
+
+def run(args) -> int:
+    """Führe den Lasttest aus; Exit-Code 1 bei Regression gegenüber der Baseline."""
+    import httpx
+
+    from benchmarks.mock_llm import MockLLMServer
+    from benchmarks.utils import environment_info
+
+    # Ein Log-Eintrag pro A2A-Abfrage würde die Ausgabe überfluten
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    levels = [int(level) for level in str(args.concurrency).split(",") if level]
+    mix = parse_mix(args.mix)
+    prompts = build_prompts(mix, args.requests, args.seed)
+    agent_env = dict(item.split("=", 1) for item in args.agent_env)
+
+    report = {
+        "environment": environment_info(),
+        "config": {key: value for key, value in vars(args).items() if key != "func"},
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent_path = (
+            Path(args.agent).resolve()
+            if args.agent
+            else render_agent(args.template, Path(tmp))
+        )
+        try:
+            server_command(agent_path, 0)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+
+        with MockLLMServer(
+            args.latency, args.tokens_per_second, args.response_tokens
+        ) as mock:
+            env = {
+                "AGENT_LLM_ENDPOINT": mock.base_url,
+                "AGENT_LLM_API_KEY": "sk-loadtest",
+                "AGENT_LLM_MODEL": "mock",
+                # Mock-Antworten nicht im Disk-Cache neben dem Agent ablegen
+                "AGENT_CACHE_PATH": str(Path(tmp) / "responses.sqlite"),
+                **agent_env,
+            }
+            with AgentProcess(agent_path, env) as agent:
+                for level in levels:
+                    print(
+                        f"⏱️  Parallelität {level}: {len(prompts)} Anfragen...",
+                        file=sys.stderr,
+                    )
+                    report["scenarios"][f"a2a_c{level}"] = asyncio.run(
+                        drive(agent.url, prompts, level)
+                    )
+                report["peak_rss_mb"] = agent.peak_rss_mb()
+            report["mock_llm"] = httpx.get(f"{mock.url}/stats").json()
+
+    if report["peak_rss_mb"] is None:
+        # Ohne /proc: Maximum aller beendeten Kindprozesse
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        report["peak_rss_mb"] = (
+            peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        )
+
+    for name, scenario in report["scenarios"].items():
+        print(
+            f"{name:>10}: {scenario['requests_per_second']:7.1f} req/s  "
+            f"p50 {scenario['p50_ms']:7.0f} ms  p95 {scenario['p95_ms']:7.0f} ms  "
+            f"p99 {scenario['p99_ms']:7.0f} ms  Fehler {scenario['error_rate']:.1%}",
+            file=sys.stderr,
+        )
+    print(f"Peak RSS Agent: {report['peak_rss_mb']:.0f} MB", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        report["regressions"] = regressions
+        for line in regressions:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        if not regressions:
+            print("✅ Keine Regression gegenüber der Baseline", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Ergebnis: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(output + "\n", encoding="utf-8")
+        print(f"Baseline gespeichert: {args.save_baseline}", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+def main():
+    """Kommandozeile für `python -m benchmarks.loadtest`."""
+    parser = argparse.ArgumentParser(description="Lasttest für generierte Agent-Server")
+    add_arguments(parser)
+    return run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""
+Lokaler Mock eines OpenAI-kompatiblen Chat-Completions-Servers
+
+Antwortet mit konfigurierbarer Latenz (Zeit bis zum ersten Token) und
+Token-Rate, wahlweise gestreamt (SSE). Fordert der Client strukturierte
+Ausgabe über ein `final_result`-Tool an, wird ein passender Tool-Call aus
+dem JSON-Schema erzeugt.
+
+Standalone: python -m benchmarks.mock_llm --port 8765 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from benchmarks.utils import ThreadedServer
+
+WORDS = (
+    "Der Agent analysiert die Anfrage sorgfältig und liefert eine präzise, "
+    "strukturierte und hilfreiche Antwort auf Deutsch"
+).split()
+
+
+def example_from_schema(schema: dict, defs: dict | None = None):
+    """Erzeuge einen minimalen gültigen Wert für ein JSON-Schema."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+
+    if "$ref" in schema:
+        return example_from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"]
+            return example_from_schema((options or schema[key])[0], defs)
+
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return {
+            name: example_from_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}), defs)]
+    if kind == "integer":
+        return schema.get("minimum", 0)
+    if kind == "number":
+        return float(schema.get("minimum", 0))
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return " ".join(WORDS[:8])
+
+
+def create_mock_llm_app(
+    latency: float = 0.2,
+    tokens_per_second: float = 50.0,
+    response_tokens: int = 64,
+) -> Starlette:
+    """Erstelle die Mock-App mit den gewünschten Timing-Parametern."""
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "prompt_chars": 0}
+
+    def completion_text() -> str:
+        return " ".join(WORDS[i % len(WORDS)] for i in range(response_tokens))
+
+    def output_tool(body: dict) -> dict | None:
+        for tool in body.get("tools") or []:
+            function = tool.get("function", {})
+            if function.get("name", "").startswith("final_result"):
+                return function
+        return None
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        stats["prompt_chars"] += sum(
+            len(str(m.get("content") or "")) for m in body.get("messages", [])
+        )
+
+        model = body.get("model", "mock")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        tool = output_tool(body)
+        if tool is not None:
+            arguments = json.dumps(
+                example_from_schema(tool.get("parameters", {})), ensure_ascii=False
+            )
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{uuid.uuid4().hex[:8]}",
+                        "type": "function",
+                        "function": {"name": tool["name"], "arguments": arguments},
+                    }
+                ],
+            }
+            finish_reason = "tool_calls"
+            tokens = max(1, len(arguments) // 4)
+        else:
+            text = completion_text()
+            message = {"role": "assistant", "content": text}
+            finish_reason = "stop"
+            tokens = response_tokens
+
+        usage = {
+            "prompt_tokens": stats["prompt_chars"] // 4,
+            "completion_tokens": tokens,
+            "total_tokens": stats["prompt_chars"] // 4 + tokens,
+        }
+
+        if not body.get("stream"):
+            try:
+                await asyncio.sleep(latency + tokens / tokens_per_second)
+            finally:
+                stats["in_flight"] -= 1
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": message, "finish_reason": finish_reason}
+                    ],
+                    "usage": usage,
+                }
+            )
+
+        def chunk(delta: dict, finish: str | None = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def events():
+            try:
+                await asyncio.sleep(latency)
+                if tool is not None:
+                    call = dict(message["tool_calls"][0], index=0)
+                    yield chunk({"role": "assistant", "tool_calls": [call]})
+                else:
+                    for i, word in enumerate(message["content"].split(" ")):
+                        if i:
+                            await asyncio.sleep(1 / tokens_per_second)
+                        delta = {"content": word if i == 0 else " " + word}
+                        if i == 0:
+                            delta["role"] = "assistant"
+                        yield chunk(delta)
+                yield chunk({}, finish_reason)
+                yield "data: [DONE]\n\n"
+            finally:
+                stats["in_flight"] -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def models(request: Request):
+        return JSONResponse(
+            {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+        )
+
+    async def get_stats(request: Request):
+        return JSONResponse(stats)
+
+    async def reset_stats(request: Request):
+        stats.update(requests=0, max_in_flight=0, prompt_chars=0)
+        return JSONResponse(stats)
+
+    return Starlette(
+        routes=[
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/v1/models", models, methods=["GET"]),
+            Route("/stats", get_stats, methods=["GET"]),
+            Route("/stats/reset", reset_stats, methods=["POST"]),
+        ]
+    )
+
+
+class MockLLMServer(ThreadedServer):
+    """Mock-LLM im Hintergrund-Thread; `base_url` zeigt auf `/v1`."""
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        tokens_per_second: float = 50.0,
+        response_tokens: int = 64,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        super().__init__(
+            create_mock_llm_app(latency, tokens_per_second, response_tokens),
+            host=host,
+            port=port,
+        )
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI-kompatible Basis-URL."""
+        return f"{self.url}/v1"
+
+
+def main():
+    """Starte den Mock-Server im Vordergrund."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI Chat-Completions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--response-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    app = create_mock_llm_app(
+        args.latency, args.tokens_per_second, args.response_tokens
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
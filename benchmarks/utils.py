@@ -0,0 +1,176 @@
+"""
+Hilfsfunktionen für Benchmarks: Server im Hintergrund, Statistik, Speicher
+"""
+
+import asyncio
+import importlib.util
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+import uvicorn
+
+
+class ThreadedServer:
+    """Starte eine ASGI-App mit uvicorn in einem Hintergrund-Thread."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 0):
+        """Initialisiere den Server; `port=0` wählt einen freien Port."""
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host=host, port=port, log_level="warning")
+        )
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Basis-URL des laufenden Servers."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Starte den Server und warte, bis er Verbindungen annimmt."""
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Server konnte nicht gestartet werden")
+            time.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        """Beende den Server."""
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Perzentil mit linearer Interpolation (wie numpy.percentile)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(latencies: list[float], wall_time: float, errors: int = 0) -> dict:
+    """Fasse Latenzen (Sekunden) eines Szenarios zusammen."""
+    count = len(latencies)
+    return {
+        "requests": count + errors,
+        "errors": errors,
+        "wall_seconds": wall_time,
+        "requests_per_second": count / wall_time if wall_time else 0.0,
+        "mean_ms": sum(latencies) / count * 1000 if count else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000 if count else 0.0,
+    }
+
+
+async def run_load(call, requests: int, concurrency: int) -> dict:
+    """Führe `call(i)` für `requests` Anfragen mit begrenzter Parallelität aus."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = []
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(index)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    result = summarize(latencies, time.perf_counter() - started, len(errors))
+    result["concurrency"] = concurrency
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+async def a2a_call(client, text: str, poll_interval: float = 0.01, timeout=120):
+    """Sende eine Aufgabe per A2A und warte, bis sie abgeschlossen ist."""
+    message = {"role": "user", "parts": [{"type": "text", "text": text}]}
+    response = await client.send_task(message)
+    if "error" in response:
+        raise RuntimeError(response["error"].get("message", "A2A-Fehler"))
+    task_id = response["result"]["id"]
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        task = (await client.get_task(task_id))["result"]
+        state = task["status"]["state"]
+        if state == "completed":
+            return task
+        if state in ("failed", "canceled"):
+            raise RuntimeError(f"Aufgabe {task_id}: {state}")
+        await asyncio.sleep(poll_interval)
+    raise TimeoutError(f"Aufgabe {task_id} nicht rechtzeitig abgeschlossen")
+
+
+def load_agent_module(path):
+    """Importiere eine generierte Agent-Datei als Modul."""
+    spec = importlib.util.spec_from_file_location(
+        f"generated_agent_{abs(hash(str(path)))}", path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rss_mb() -> float:
+    """Aktueller Resident Set Size des Prozesses in MB (Linux, sonst Peak)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Höchster Resident Set Size des Prozesses in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS liefert Bytes, Linux Kilobytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def environment_info() -> dict:
+    """Metadaten zum Vergleich von Ergebnissen zwischen Commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
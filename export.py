@@ -0,0 +1,141 @@
+"""
+Export generierter Agenten
+
+Jede Sitzung schreibt in ein eigenes Verzeichnis unter `AGENT_EXPORT_DIR`
+(Standard: temporäres Verzeichnis), damit sich gleichzeitige Nutzer nicht
+gegenseitig Dateien überschreiben. Alle Dateien werden atomar geschrieben
+(temporäre Datei + `os.replace`). Optional entsteht ein ZIP-Bundle mit Agent,
+`requirements.txt` und Dockerfile.
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from generator import AGENT_REQUIREMENTS
+
+DOCKERFILE_TEMPLATE = """FROM python:3.11-slim
+
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+COPY {filename} .
+{server}CMD {command}
+"""
+
+DOCKERFILE_SERVER = """ENV AGENT_HOST=0.0.0.0 AGENT_PORT=8000
+EXPOSE 8000
+"""
+
+
+@dataclass
+class ExportResult:
+    """Pfade der exportierten Dateien."""
+
+    agent_path: Path | None = None
+    requirements_path: Path | None = None
+    bundle_path: Path | None = None
+
+
+def default_export_root() -> Path:
+    """Basisverzeichnis für die Exporte aller Sitzungen."""
+    return Path(
+        os.getenv("AGENT_EXPORT_DIR")
+        or Path(tempfile.gettempdir()) / "agent_fabric_exports"
+    )
+
+
+def normalize_filename(filename: str) -> str:
+    """Flacher, sicherer Dateiname mit Endung `.py`."""
+    name = Path(filename.strip() or "mein_agent.py").name
+    name = re.sub(r"[^\w.-]", "_", name)
+    if not name.endswith(".py"):
+        name += ".py"
+    return name
+
+
+def atomic_write(path: Path, data: str | bytes):
+    """Schreibe eine Datei atomar: Leser sehen die alte oder die neue Version."""
+    if isinstance(data, str):
+        data = data.encode()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_dockerfile(filename: str, template_name: str = "standard") -> str:
+    """Dockerfile, das den Agent im passenden Modus startet."""
+    if template_name == "cli":
+        server, command = "", f'["python", "{filename}"]'
+    elif template_name == "server":
+        server, command = DOCKERFILE_SERVER, f'["python", "{filename}"]'
+    else:
+        server, command = DOCKERFILE_SERVER, f'["python", "{filename}", "server"]'
+    return DOCKERFILE_TEMPLATE.format(filename=filename, server=server, command=command)
+
+
+def build_bundle(code: str, filename: str, template_name: str = "standard") -> bytes:
+    """ZIP-Bundle (im Speicher) mit Agent, requirements.txt und Dockerfile."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr(filename, code)
+        bundle.writestr("requirements.txt", AGENT_REQUIREMENTS)
+        bundle.writestr("Dockerfile", render_dockerfile(filename, template_name))
+    return buffer.getvalue()
+
+
+class AgentExporter:
+    """Exportiert Agenten in ein Verzeichnis pro Sitzung."""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else default_export_root()
+
+    def _session_path(self, session_id: str) -> Path:
+        return self.root / re.sub(r"[^\w-]", "_", session_id or "default")
+
+    def session_dir(self, session_id: str) -> Path:
+        """Eigenes Export-Verzeichnis einer Sitzung (wird bei Bedarf angelegt)."""
+        path = self._session_path(session_id)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def export(
+        self,
+        code: str,
+        filename: str,
+        session_id: str,
+        template_name: str = "standard",
+        bundle: bool = False,
+    ) -> ExportResult:
+        """Schreibe Agent und requirements.txt oder ein ZIP-Bundle."""
+        directory = self.session_dir(session_id)
+
+        if bundle:
+            bundle_path = directory / f"{filename[:-3]}.zip"
+            atomic_write(bundle_path, build_bundle(code, filename, template_name))
+            return ExportResult(bundle_path=bundle_path)
+
+        agent_path = directory / filename
+        atomic_write(agent_path, code)
+
+        # Inhalt ist fest, daher nur einmal pro Sitzung schreiben
+        requirements_path = directory / "requirements.txt"
+        if not requirements_path.exists():
+            atomic_write(requirements_path, AGENT_REQUIREMENTS)
+
+        return ExportResult(agent_path=agent_path, requirements_path=requirements_path)
+
+    def cleanup(self, session_id: str):
+        """Entferne das Export-Verzeichnis einer Sitzung."""
+        shutil.rmtree(self._session_path(session_id), ignore_errors=True)
@@ -1,29 +1,32 @@
-from jinja2 import Template
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 
-class AgentGenerator:
-    """Generator für PydanticAI Agenten basierend auf natürlicher Sprache."""
+from history import GenerationHistory
+from llm_pool import LLMPool
+from metrics import FALLBACKS, PROMPT_CACHE_LOOKUPS, span
+from prompt_cache import PromptCache, default_cache_path
 
-    def __init__(self):
-        """Initialisiere den AgentGenerator mit einem Prompt-Engineering-Agent."""
-        self.prompt_engineer = self._create_prompt_engineer()
+logger = logging.getLogger(__name__)
 
-    def _create_prompt_engineer(self):
-        """Erstelle einen AI-Agent für intelligente System-Prompt-Generierung."""
-        from pydantic_ai import Agent
-        from pydantic_ai.models.openai import OpenAIModel
-        from pydantic_ai.providers.openai import OpenAIProvider
-        import os
-
-        # LLM Setup (aus Umgebung oder Standard)
-        endpoint = os.getenv("LLM_ENDPOINT", "http://localhost:11434/v1")
-        api_key = os.getenv("LLM_API_KEY", "sk-dummy")
-        model_name = os.getenv("LLM_MODEL", "qwen2.5:latest")
+TEMPLATE_DIR = Path(__file__).parent / "templates"
 
-        provider = OpenAIProvider(base_url=endpoint, api_key=api_key)
-        model = OpenAIModel(provider=provider, model_name=model_name)
+# Verfügbare Agent-Templates (Name -> Datei in TEMPLATE_DIR)
+AGENT_TEMPLATES = {
+    "standard": "agent.py.j2",
+    "cli": "agent_cli.py.j2",
+    "server": "agent_server.py.j2",
+    "mcp": "agent_mcp.py.j2",
+}
 
-        system_prompt = """Du bist ein Experte für AI-Agent System-Prompt Engineering.
+PROMPT_ENGINEER_SYSTEM_PROMPT = """Du bist ein Experte für AI-Agent System-Prompt Engineering.
 
 Analysiere die Nutzerbeschreibung und erstelle einen perfekt spezialisierten System-Prompt für den gewünschten AI-Agent.
 
@@ -39,221 +42,816 @@ Für Prompt Creator/Engineer: Erstelle einen System-Prompt der bei jeder Anfrage
 
 Antworte NUR mit dem System-Prompt, keine Erklärungen."""
 
-        return Agent(model=model, system_prompt=system_prompt, retries=2)
+DEFAULT_RESPONSE_MODEL = (
+    "response",
+    '''class AgentResponse(BaseModel):
+    """Response-Model für den generierten Agent."""
+    
+    response: str = Field(description="Die Hauptantwort des Agents")
+    status: str = Field(default="success", description="Status der Ausführung")
+    additional_info: Optional[dict] = Field(default=None, description="Zusätzliche Informationen")''',
+)
+
+# Aufgabenspezifische Response-Models: (Schlüsselwörter, Streaming-Feld, Klasse).
+# Das erste Feld ist Pflicht, alle weiteren haben Defaults, damit schon
+# Teilantworten validieren und gestreamt werden können.
+RESPONSE_MODELS = [
+    (
+        ("stimmung", "sentiment", "emotion"),
+        "explanation",
+        '''class AgentResponse(BaseModel):
+    """Ergebnis einer Sentiment-Analyse."""
+
+    sentiment: Literal["positiv", "negativ", "neutral", "gemischt"] = Field(description="Erkannte Stimmung")
+    score: float = Field(default=0.0, ge=-1.0, le=1.0, description="Stimmungswert von -1 (negativ) bis 1 (positiv)")
+    explanation: str = Field(default="", description="Kurze Begründung")''',
+    ),
+    (
+        ("konvertier", "convert", "umwandl"),
+        "code",
+        '''class AgentResponse(BaseModel):
+    """Konvertierter Code."""
+
+    code: str = Field(description="Der vollständige Code in der Zielsprache")
+    language: Optional[str] = Field(default=None, description="Zielsprache")
+    explanation: str = Field(default="", description="Hinweise zur Konvertierung")''',
+    ),
+    (
+        ("übersetz", "translat"),
+        "translation",
+        '''class AgentResponse(BaseModel):
+    """Ergebnis einer Übersetzung."""
+
+    translation: str = Field(description="Der übersetzte Text")
+    source_language: Optional[str] = Field(default=None, description="Erkannte Ausgangssprache")
+    target_language: Optional[str] = Field(default=None, description="Zielsprache")''',
+    ),
+    (
+        ("zusammenfass", "summar"),
+        "summary",
+        '''class AgentResponse(BaseModel):
+    """Zusammenfassung eines Textes."""
+
+    summary: str = Field(description="Die Zusammenfassung")
+    key_points: list[str] = Field(default_factory=list, description="Die wichtigsten Punkte")''',
+    ),
+    (
+        ("korrigier", "grammatik", "rechtschreib", "grammar", "proofread", "correct"),
+        "corrected_text",
+        '''class AgentResponse(BaseModel):
+    """Korrigierter Text."""
+
+    corrected_text: str = Field(description="Der korrigierte Text")
+    changes: list[str] = Field(default_factory=list, description="Vorgenommene Änderungen")''',
+    ),
+]
+
+# Der A2A-Worker im Template nutzt die Task-/Message-Strukturen von fasta2a 0.3
+# und `mcp_servers`/`run_mcp_servers()` von pydantic-ai 0.3; neuere Versionen
+# sind nicht getestet
+AGENT_REQUIREMENTS = """# Dependencies für generierten Agent
+pydantic-ai>=0.3,<0.4
+pydantic-ai-slim[a2a,mcp]>=0.3,<0.4
+fasta2a>=0.3,<0.4
+fastapi>=0.115.12
+uvicorn[standard]>=0.34.0
+httpx[http2]>=0.27.0
+pydantic[email]>=2.11.3
+"""
+
+
+# HTTP-Client generierter Agenten zum LLM (im Agent per AGENT_HTTP_* überschreibbar)
+DEFAULT_HTTP_SETTINGS = {
+    "max_connections": 32,
+    "max_keepalive_connections": 16,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+    "connect_timeout": 5.0,
+    "read_timeout": 120.0,
+    "max_retries": 3,
+    "retry_backoff": 0.5,
+}
+
+
+def resolve_http_settings(overrides: dict | None) -> dict:
+    """Ergänze `DEFAULT_HTTP_SETTINGS` um gesetzte Werte aus `overrides`.
+
+    Leere Werte (`None`, z.B. ein geleertes Zahlenfeld in der UI) behalten den
+    Standardwert; Zahlen werden in den Typ des Standardwerts umgewandelt.
+    """
+    settings = dict(DEFAULT_HTTP_SETTINGS)
+    for name, value in (overrides or {}).items():
+        if name not in DEFAULT_HTTP_SETTINGS:
+            raise ValueError(f"Unbekannte HTTP-Einstellung '{name}'")
+        if value is None:
+            continue
+
+        default = DEFAULT_HTTP_SETTINGS[name]
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise TypeError(
+                    f"HTTP-Einstellung '{name}' muss ein Wahrheitswert sein"
+                )
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"HTTP-Einstellung '{name}' muss eine Zahl sein")
+        elif value < 0:
+            raise ValueError(f"HTTP-Einstellung '{name}' darf nicht negativ sein")
+        elif isinstance(default, int):
+            if value != int(value):
+                raise ValueError(f"HTTP-Einstellung '{name}' muss ganzzahlig sein")
+            value = int(value)
+        else:
+            value = float(value)
+        settings[name] = value
+    return settings
+
+
+@dataclass
+class AgentSettings:
+    """Einstellungen, mit denen ein Agent gerendert wird (ohne API-Key).
+
+    Mit `response_cache=True` enthält der Agent einen Antwort-Cache vor
+    `run_agent`, dessen Schlüssel an System-Prompt, Endpoint und Model des
+    laufenden Agents gebunden ist.
+    Mit `micro_batching=True` bündelt `run_agent` gleichzeitige Anfragen zu
+    einem LLM-Aufruf. `http_settings` überschreibt einzelne Werte aus
+    `DEFAULT_HTTP_SETTINGS` für den HTTP-Client des Agents.
+    """
+
+    use_mcp: bool = False
+    llm_endpoint: str = "http://localhost:11434/v1"
+    llm_model: str = "qwen2.5:latest"
+    filename: str = "generated_agent.py"
+    template_name: str = "standard"
+    response_cache: bool = False
+    micro_batching: bool = False
+    http_settings: dict | None = None
+
+    def __post_init__(self):
+        # Ungültige HTTP-Einstellungen vor dem LLM-Aufruf ablehnen
+        resolve_http_settings(self.http_settings)
+
+
+@dataclass
+class BatchResult:
+    """Ergebnis eines einzelnen Agenten aus einer Batch-Generierung."""
+
+    description: str
+    filename: str
+    status: str = "ok"
+    latency: float = 0.0
+    error: str | None = None
+
+
+def create_template_environment() -> Environment:
+    """Erstelle die Jinja2-Umgebung mit Bytecode-Cache für die Agent-Templates."""
+    cache_dir = os.getenv("TEMPLATE_CACHE_DIR") or default_cache_path().parent / "jinja"
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+    )
+
+
+class AgentGenerator:
+    """Generator für PydanticAI Agenten basierend auf natürlicher Sprache."""
+
+    def __init__(
+        self,
+        prompt_cache: PromptCache | None = None,
+        history: GenerationHistory | None = None,
+        max_concurrency: int | None = None,
+    ):
+        """Initialisiere den AgentGenerator mit einem Prompt-Engineering-Agent.
+
+        Ohne `history` werden Generierungen nicht im Verlauf gespeichert.
+        `max_concurrency` begrenzt gleichzeitige Prompt-Engineer-Aufrufe
+        (Standard: `LLM_CONCURRENCY` bzw. 4), weitere warten in Reihenfolge.
+        """
+        if prompt_cache is None:
+            prompt_cache = PromptCache.from_env()
+        self.prompt_cache = prompt_cache
+        self.history = history
+
+        # Templates einmalig beim Start kompilieren
+        self.template_env = create_template_environment()
+        self.templates = {
+            name: self.template_env.get_template(template_file)
+            for name, template_file in AGENT_TEMPLATES.items()
+        }
+
+        # Standard-LLM (aus Umgebung), falls keine Einstellungen übergeben werden
+        self.llm_endpoint = os.getenv("LLM_ENDPOINT", "http://localhost:11434/v1")
+        self.llm_api_key = os.getenv("LLM_API_KEY", "sk-dummy")
+        self.prompt_engineer_model = os.getenv("LLM_MODEL", "qwen2.5:latest")
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        # Kapazität des LLM-Backends; wird nur auf der LLM-Loop genutzt
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_CONCURRENCY", "4"))
+        self._llm_slots = None
+        self._llm_waiting = 0
+        self._llm_active = 0
+        # Prompt-Engineer pro (Endpoint, Model, Key); wird nur auf der LLM-Loop genutzt
+        self.llm_pool = LLMPool(
+            agent_factory=self._create_prompt_engineer,
+            idle_timeout=float(os.getenv("LLM_POOL_IDLE_TIMEOUT", "600")),
+        )
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Liefere die langlebige Event-Loop für LLM-Aufrufe (eigener Thread)."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._llm_slots = asyncio.Semaphore(self.max_concurrency)
+                threading.Thread(
+                    target=loop.run_forever, name="agent-fabric-llm", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    @asynccontextmanager
+    async def _llm_slot(self):
+        """Belege einen der `max_concurrency` Plätze für einen LLM-Aufruf."""
+        if self._llm_slots is None:
+            self._llm_slots = asyncio.Semaphore(self.max_concurrency)
+        self._llm_waiting += 1
+        try:
+            await self._llm_slots.acquire()
+        finally:
+            self._llm_waiting -= 1
+        self._llm_active += 1
+        try:
+            yield
+        finally:
+            self._llm_active -= 1
+            self._llm_slots.release()
+
+    def llm_stats(self) -> dict:
+        """Laufende und wartende Prompt-Engineer-Aufrufe."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._llm_active,
+            "waiting": self._llm_waiting,
+        }
+
+    def _submit(self, coro):
+        """Plane eine Coroutine auf der LLM-Loop ein (liefert concurrent Future)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def close(self):
+        """Schließe die gepoolten HTTP-Clients und beende die LLM-Loop."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.llm_pool.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _create_prompt_engineer(self, model):
+        """Erstelle einen AI-Agent für intelligente System-Prompt-Generierung."""
+        from pydantic_ai import Agent
+
+        return Agent(
+            model=model, system_prompt=PROMPT_ENGINEER_SYSTEM_PROMPT, retries=2
+        )
 
     def generate_agent(
         self,
         description: str,
-        use_mcp: bool = False,
-        llm_endpoint: str = "http://localhost:11434/v1",
+        *,
+        llm_api_key: str = "sk-dummy",
+        force_regenerate: bool = False,
+        **settings,
+    ) -> str:
+        """Generiere Agent-Code basierend auf Beschreibung.
+
+        Alle Argumente nach `description` sind Schlüsselwort-Argumente;
+        `settings` sind die Felder von `AgentSettings`.
+        """
+        settings = AgentSettings(**settings)
+
+        with span("generate_agent"):
+            # Generiere System-Prompt basierend auf Beschreibung
+            system_prompt, is_fallback = self._generate_system_prompt(
+                description,
+                llm_endpoint=settings.llm_endpoint,
+                llm_api_key=llm_api_key,
+                llm_model=settings.llm_model,
+                force_regenerate=force_regenerate,
+            )
+
+            code = self._render_agent(description, system_prompt, settings, llm_api_key)
+            if not is_fallback:
+                self._record_generation(description, system_prompt, settings)
+            return code
+
+    async def agenerate_agent(
+        self,
+        description: str,
+        *,
         llm_api_key: str = "sk-dummy",
-        llm_model: str = "qwen2.5:latest",
-        filename: str = "generated_agent.py",
+        force_regenerate: bool = False,
+        **settings,
     ) -> str:
-        """Generiere Agent-Code basierend auf Beschreibung."""
+        """Generiere Agent-Code asynchron, ohne einen Worker-Thread zu blockieren."""
+        settings = AgentSettings(**settings)
+
+        with span("agenerate_agent"):
+            system_prompt, is_fallback = await self._agenerate_system_prompt(
+                description,
+                llm_endpoint=settings.llm_endpoint,
+                llm_api_key=llm_api_key,
+                llm_model=settings.llm_model,
+                force_regenerate=force_regenerate,
+            )
+
+            code = self._render_agent(description, system_prompt, settings, llm_api_key)
+            if not is_fallback:
+                self._record_generation(description, system_prompt, settings)
+            return code
+
+    async def astream_agent(
+        self,
+        description: str,
+        *,
+        llm_api_key: str = "sk-dummy",
+        force_regenerate: bool = False,
+        **settings,
+    ):
+        """Generiere Agent-Code mit Zwischenständen, während der System-Prompt streamt.
+
+        Der letzte gelieferte Wert ist der fertige Code.
+        """
+        settings = AgentSettings(**settings)
+
+        with span("astream_agent"):
+            system_prompt, is_fallback = None, False
+            async for system_prompt, is_fallback in self._astream_system_prompt(
+                description,
+                llm_endpoint=settings.llm_endpoint,
+                llm_api_key=llm_api_key,
+                llm_model=settings.llm_model,
+                force_regenerate=force_regenerate,
+            ):
+                yield self._render_agent(
+                    description, system_prompt, settings, llm_api_key
+                )
+
+            if system_prompt is not None and not is_fallback:
+                self._record_generation(description, system_prompt, settings)
+
+    def rerender_agent(
+        self, entry_id: int, llm_api_key: str | None = None, **changes
+    ) -> tuple[str, int]:
+        """Rendere einen Agent aus dem Verlauf mit geänderten Einstellungen neu.
+
+        System-Prompt und Response-Model stammen aus dem Verlaufseintrag, es
+        gibt also keinen LLM-Aufruf. `changes` sind Felder von
+        `AgentSettings`. Liefert den Code und die ID des neuen
+        Verlaufseintrags.
+        """
+        if self.history is None:
+            raise RuntimeError("Kein Generierungsverlauf konfiguriert")
+        entry = self.history.get(entry_id)
+        if entry is None:
+            raise KeyError(f"Verlaufseintrag {entry_id} nicht gefunden")
+
+        settings = AgentSettings(**{**entry["settings"], **changes})
+        with span("rerender_agent"):
+            code = self._render_agent(
+                entry["description"],
+                entry["system_prompt"],
+                settings,
+                llm_api_key or self.llm_api_key,
+                response_model=(entry["response_model"], entry["output_text_field"]),
+            )
+
+        new_id = self.history.add(
+            entry["description"],
+            entry["system_prompt"],
+            entry["response_model"],
+            entry["output_text_field"],
+            asdict(settings),
+            parent_id=entry_id,
+        )
+        return code, new_id
+
+    def _record_generation(
+        self, description: str, system_prompt: str, settings: AgentSettings
+    ):
+        """Lege eine fertige Generierung im Verlauf ab (falls aktiviert).
+
+        Fallback-Prompts werden nicht abgelegt, damit ein späteres Neu-Rendern
+        nicht dauerhaft auf ihnen aufbaut.
+        """
+        if self.history is None:
+            return None
+        response_model, output_text_field = self._generate_response_model(description)
+        return self.history.add(
+            description,
+            system_prompt,
+            response_model,
+            output_text_field,
+            asdict(settings),
+        )
 
-        template_content = self._get_base_template()
-        template = Template(template_content)
+    def generate_batch(
+        self, items: list[dict], output_dir, **kwargs
+    ) -> list[BatchResult]:
+        """Synchrone Variante von `agenerate_batch`."""
+        return asyncio.run(self.agenerate_batch(items, output_dir, **kwargs))
 
-        # Generiere System-Prompt basierend auf Beschreibung
-        system_prompt = self._generate_system_prompt(description)
+    async def agenerate_batch(
+        self,
+        items: list[dict],
+        output_dir,
+        concurrency: int = 4,
+        llm_endpoint: str | None = None,
+        llm_api_key: str | None = None,
+        llm_model: str | None = None,
+        force_regenerate: bool = False,
+    ) -> list[BatchResult]:
+        """Generiere viele Agenten parallel und schreibe sie nach `output_dir`.
+
+        Jedes Item ist ein dict mit `description` und optional `filename`,
+        `use_mcp`, `template_name`, `response_cache`, `micro_batching` und
+        `http_settings`. Höchstens `concurrency` Anfragen laufen
+        gleichzeitig gegen den Prompt-Engineer; identische Beschreibungen
+        werden nur einmal angefragt. Alle Agenten teilen sich eine
+        `requirements.txt`. Die Plätze des Generators (`max_concurrency`)
+        gelten zusätzlich, er sollte also mit mindestens `concurrency`
+        erstellt werden.
+        """
+        if concurrency > self.max_concurrency:
+            logger.warning(
+                f"Batch-Parallelität {concurrency} wird durch "
+                f"max_concurrency={self.max_concurrency} des Generators begrenzt"
+            )
+        llm_endpoint = llm_endpoint or self.llm_endpoint
+        llm_api_key = llm_api_key or self.llm_api_key
+        llm_model = llm_model or self.prompt_engineer_model
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        prompt_tasks: dict[str, asyncio.Future] = {}
+
+        async def request_system_prompt(description: str) -> str:
+            async with semaphore:
+                system_prompt, _ = await asyncio.wrap_future(
+                    self._submit(
+                        self._generate_system_prompt_ai(
+                            description,
+                            llm_endpoint=llm_endpoint,
+                            llm_api_key=llm_api_key,
+                            llm_model=llm_model,
+                            force_regenerate=force_regenerate,
+                            fallback=False,
+                        )
+                    )
+                )
+                return system_prompt
+
+        async def build(item: dict, filename: str) -> BatchResult:
+            description = item["description"]
+            result = BatchResult(description=description, filename=filename)
+            started = time.perf_counter()
+
+            # Duplikate teilen sich dieselbe Anfrage
+            key = PromptCache.normalize(description)
+            if key not in prompt_tasks:
+                prompt_tasks[key] = asyncio.ensure_future(
+                    request_system_prompt(description)
+                )
+
+            try:
+                system_prompt = await prompt_tasks[key]
+            except Exception as e:
+                result.status = "fallback"
+                result.error = str(e) or type(e).__name__
+                FALLBACKS.inc(reason=type(e).__name__)
+                system_prompt = self._fallback_system_prompt(description)
+
+            try:
+                settings = AgentSettings(
+                    use_mcp=bool(item.get("use_mcp", False)),
+                    llm_endpoint=llm_endpoint,
+                    llm_model=llm_model,
+                    filename=filename,
+                    template_name=item.get("template_name") or "standard",
+                    response_cache=bool(item.get("response_cache", False)),
+                    micro_batching=bool(item.get("micro_batching", False)),
+                    http_settings=item.get("http_settings"),
+                )
+                code = self._render_agent(
+                    description, system_prompt, settings, llm_api_key
+                )
+                (output_dir / filename).write_text(code, encoding="utf-8")
+            except Exception as e:
+                result.status = "error"
+                result.error = str(e) or type(e).__name__
+
+            result.latency = time.perf_counter() - started
+            return result
+
+        filenames = self._batch_filenames(items)
+        results = await asyncio.gather(
+            *(build(item, filename) for item, filename in zip(items, filenames))
+        )
 
-        # Generiere Pydantic-Response-Model basierend auf Beschreibung
-        response_model = self._generate_response_model(description)
-
-        code = template.render(
-            description=description,
-            system_prompt=system_prompt,
-            response_model=response_model,
-            use_mcp=use_mcp,
-            llm_endpoint=llm_endpoint,
-            llm_api_key=llm_api_key,
-            llm_model=llm_model,
-            filename=filename,
+        (output_dir / "requirements.txt").write_text(
+            AGENT_REQUIREMENTS, encoding="utf-8"
         )
+        return list(results)
+
+    def _batch_filenames(self, items: list[dict]) -> list[str]:
+        """Eindeutige, flache Dateinamen für die Agenten einer Batch."""
+        used = set()
+        filenames = []
+        for index, item in enumerate(items, 1):
+            filename = Path(item.get("filename") or f"agent_{index:03d}.py").name
+            if not filename.endswith(".py"):
+                filename += ".py"
+
+            stem, suffix = filename[:-3], 2
+            while filename in used:
+                filename = f"{stem}_{suffix}.py"
+                suffix += 1
+
+            used.add(filename)
+            filenames.append(filename)
+        return filenames
+
+    def _render_agent(
+        self,
+        description: str,
+        system_prompt: str,
+        settings: AgentSettings,
+        llm_api_key: str = "sk-dummy",
+        response_model: tuple[str, str] | None = None,
+    ) -> str:
+        """Rendere das Agent-Template mit einem fertigen System-Prompt.
 
-        return code
+        `response_model` ist ein bereits bestimmtes (Quelltext, Textfeld)-Paar,
+        z.B. aus dem Verlauf.
+        """
 
-    def _get_base_template(self) -> str:
-        """Lade das Basis-Template für Agenten."""
-        return '''#!/usr/bin/env python3
-"""
-Generierter Agent: {{ description }}
-Erstellt mit Agent Fabric
+        template = self._get_base_template(settings.template_name)
 
-Installationsanleitung:
-1. pip install -r requirements.txt
-2. python {{ filename }}
+        # Generiere Pydantic-Response-Model basierend auf Beschreibung
+        if response_model is None:
+            with span("generate_response_model"):
+                response_model = self._generate_response_model(description)
+        response_model, output_text_field = response_model
+
+        with span("render_template"):
+            code = template.render(
+                description=description,
+                system_prompt=system_prompt,
+                response_model=response_model,
+                output_text_field=output_text_field,
+                use_mcp=settings.use_mcp,
+                llm_endpoint=settings.llm_endpoint,
+                llm_api_key=llm_api_key,
+                llm_model=settings.llm_model,
+                filename=settings.filename,
+                response_cache=settings.response_cache,
+                micro_batching=settings.micro_batching,
+                http=resolve_http_settings(settings.http_settings),
+            )
 
-Oder mit uv:
-1. uv add pydantic-ai pydantic-ai-slim[a2a] fasta2a fastapi uvicorn
-2. python {{ filename }}
-"""
+        return code
 
-import os
-from typing import Optional, Any
-from pydantic import BaseModel, Field
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
-{% if use_mcp %}
-from pydantic_ai.mcp import MCP
-{% endif %}
-
-# Response Model
-{{ response_model }}
-
-# Agent-Konfiguration
-def create_agent() -> Agent:
-    """Erstelle und konfiguriere den Agent."""
-    
-    # LLM-Konfiguration
-    llm_endpoint = {{ llm_endpoint|tojson }}
-    llm_api_key = {{ llm_api_key|tojson }}
-    llm_model_name = {{ llm_model|tojson }}
-    
-    print(f"Verbinde mit: {llm_endpoint}")
-    print(f"Model: {llm_model_name}")
-    
-    # Provider und Model erstellen
-    provider = OpenAIProvider(base_url=llm_endpoint, api_key=llm_api_key)
-    model = OpenAIModel(provider=provider, model_name=llm_model_name)
-    
-    # System-Prompt
-    system_prompt = {{ system_prompt|tojson }}
-    
-    # Agent erstellen
-    agent = Agent(
-        model=model,
-        retries=3,
-        system_prompt=system_prompt
-    )
-    
-    return agent
-
-{% if use_mcp %}
-# MCP Server Integration (optional)
-# Hier können MCP Server konfiguriert werden
-{% endif %}
-
-# Agent-Instanz
-agent = create_agent()
-
-# A2A-kompatible App erstellen
-app = agent.to_a2a()
-
-async def run_agent(user_input: str):
-    """Führe den Agent mit Benutzereingabe aus."""
-    try:
-        result = await agent.run(user_input)
-        
-        # Verwende result.output statt result.data
-        if hasattr(result, 'output'):
-            return result.output
-        elif hasattr(result, 'data'):
-            return result.data
-        else:
-            return str(result)
-            
-    except Exception as e:
-        return f"Entschuldigung, es gab einen Fehler: {str(e)}"
-
-if __name__ == "__main__":
-    import sys
-    import uvicorn
-    
-    # Agent-Beschreibung als Variable
-    agent_description = {{ description|tojson }}
-    
-    if len(sys.argv) > 1 and sys.argv[1] == "server":
-        print("🚀 Starte Agent als A2A Server...")
-        print("Agent-Beschreibung:", agent_description)
-        print("Server läuft auf: http://0.0.0.0:8000")
-        print("Health Check: http://0.0.0.0:8000/health")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
-    else:
-        print("🤖", agent_description)
-        print("=" * 50)
-        print("Interaktiver Modus - Geben Sie 'exit' zum Beenden ein")
-        print("Für Server-Modus: python {{ filename }} server")
-        print()
-        
-        import asyncio
-        
-        async def interactive_mode():
-            while True:
-                try:
-                    user_input = input("Sie: ").strip()
-                    if user_input.lower() in ['exit', 'quit', 'bye']:
-                        print("Auf Wiedersehen! 👋")
-                        break
-                    
-                    if user_input:
-                        result = await run_agent(user_input)
-                        print(f"Agent: {result}")
-                        print()
-                
-                except KeyboardInterrupt:
-                    print("\\nAuf Wiedersehen! 👋")
-                    break
-                except Exception as e:
-                    print(f"Fehler: {e}\\n")
-        
-        asyncio.run(interactive_mode())
-'''
-
-    async def _generate_system_prompt_ai(self, description: str) -> str:
-        """Verwende AI-Agent um optimalen System-Prompt zu generieren."""
+    def _get_base_template(self, template_name: str = "standard") -> Template:
+        """Liefere das beim Start kompilierte Agent-Template."""
         try:
-            prompt_request = f"""Erstelle einen optimalen System-Prompt für einen AI-Agent basierend auf dieser Beschreibung:
-
-"{description}"
-
-Der System-Prompt soll den Agent perfekt für diese spezifische Aufgabe konfigurieren."""
+            return self.templates[template_name]
+        except KeyError:
+            raise ValueError(
+                f"Unbekanntes Template '{template_name}' "
+                f"(verfügbar: {', '.join(AGENT_TEMPLATES)})"
+            ) from None
+
+    async def _generate_system_prompt_ai(
+        self,
+        description: str,
+        llm_endpoint: str | None = None,
+        llm_api_key: str | None = None,
+        llm_model: str | None = None,
+        force_regenerate: bool = False,
+        fallback: bool = True,
+    ) -> tuple[str, bool]:
+        """Verwende AI-Agent um optimalen System-Prompt zu generieren.
+
+        Liefert `(system_prompt, is_fallback)`. Mit `fallback=False` werden
+        Fehler weitergereicht, statt still auf einen einfachen Prompt
+        auszuweichen.
+        """
+        llm_endpoint = llm_endpoint or self.llm_endpoint
+        llm_api_key = llm_api_key or self.llm_api_key
+        llm_model = llm_model or self.prompt_engineer_model
+
+        cache_key = PromptCache.make_key(
+            description, PROMPT_ENGINEER_SYSTEM_PROMPT, llm_model
+        )
+        if not force_regenerate:
+            cached = self._lookup_prompt_cache(cache_key)
+            if cached is not None:
+                return cached, False
 
-            result = await self.prompt_engineer.run(prompt_request)
+        try:
+            async with self._llm_slot():
+                with span("system_prompt_llm"):
+                    prompt_engineer = await self.llm_pool.get_agent(
+                        llm_endpoint, llm_api_key, llm_model
+                    )
+                    result = await prompt_engineer.run(
+                        self._prompt_request(description)
+                    )
 
             if hasattr(result, "output"):
-                return result.output
+                system_prompt = result.output
             elif hasattr(result, "data"):
-                return result.data
+                system_prompt = result.data
             else:
-                return str(result)
+                system_prompt = str(result)
+            if not system_prompt.strip():
+                raise ValueError("Prompt-Engineer lieferte einen leeren System-Prompt")
 
         except Exception as e:
-            # Fallback auf einfachen Prompt
-            return f"""Du bist ein spezialisierter AI-Agent.
+            if not fallback:
+                raise
+            # Fallback auf einfachen Prompt (wird nicht gecacht)
+            logger.warning(f"Prompt-Engineer fehlgeschlagen ({llm_endpoint}): {e}")
+            FALLBACKS.inc(reason=type(e).__name__)
+            return self._fallback_system_prompt(description), True
 
-Aufgabe: {description}
+        self.prompt_cache.set(cache_key, system_prompt)
+        return system_prompt, False
 
-Führe deine Aufgabe professionell und präzise aus. Gib strukturierte, hilfreiche Antworten."""
+    async def _stream_system_prompt_ai(
+        self,
+        description: str,
+        llm_endpoint: str | None = None,
+        llm_api_key: str | None = None,
+        llm_model: str | None = None,
+        force_regenerate: bool = False,
+    ):
+        """Streame den System-Prompt des AI-Agents (läuft auf der LLM-Loop).
+
+        Liefert `(bisher erzeugter Text, is_fallback)`; der letzte Wert ist
+        der vollständige Prompt (oder der Fallback, falls der Agent scheitert).
+        """
+        llm_endpoint = llm_endpoint or self.llm_endpoint
+        llm_api_key = llm_api_key or self.llm_api_key
+        llm_model = llm_model or self.prompt_engineer_model
+
+        cache_key = PromptCache.make_key(
+            description, PROMPT_ENGINEER_SYSTEM_PROMPT, llm_model
+        )
+        if not force_regenerate:
+            cached = self._lookup_prompt_cache(cache_key)
+            if cached is not None:
+                yield cached, False
+                return
 
-    def _generate_system_prompt(self, description: str) -> str:
-        """Generiere intelligenten System-Prompt mit AI-Agent."""
-        import asyncio
+        try:
+            async with self._llm_slot():
+                with span("system_prompt_llm_stream"):
+                    prompt_engineer = await self.llm_pool.get_agent(
+                        llm_endpoint, llm_api_key, llm_model
+                    )
+                    async with prompt_engineer.run_stream(
+                        self._prompt_request(description)
+                    ) as result:
+                        system_prompt = ""
+                        async for system_prompt in result.stream_text(debounce_by=0.1):
+                            yield system_prompt, False
+            if not system_prompt.strip():
+                raise ValueError("Prompt-Engineer lieferte einen leeren System-Prompt")
+        except Exception as e:
+            # Fallback auf einfachen Prompt (wird nicht gecacht)
+            logger.warning(f"Prompt-Engineer fehlgeschlagen ({llm_endpoint}): {e}")
+            FALLBACKS.inc(reason=type(e).__name__)
+            yield self._fallback_system_prompt(description), True
+            return
+
+        self.prompt_cache.set(cache_key, system_prompt)
+
+    async def _astream_system_prompt(self, description: str, **kwargs):
+        """Reiche den Stream von der LLM-Loop an die aufrufende Loop weiter."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        async def produce():
+            try:
+                async for item in self._stream_system_prompt_ai(description, **kwargs):
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        future = self._submit(produce())
+        try:
+            while (item := await queue.get()) is not done:
+                yield item
+        finally:
+            # Abbruch beim Client (z.B. Seite geschlossen) stoppt auch das LLM
+            future.cancel()
+
+    def _lookup_prompt_cache(self, cache_key: str) -> str | None:
+        """Lies den Prompt-Cache und zähle Treffer/Fehlversuche."""
+        cached = self.prompt_cache.get(cache_key)
+        if cached is not None and not cached.strip():
+            # Leere Einträge (aus älteren Versionen) zählen als Fehlversuch
+            cached = None
+        PROMPT_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        return cached
+
+    def _prompt_request(self, description: str) -> str:
+        """Anfrage an den Prompt-Engineer für eine Agent-Beschreibung."""
+        return f"""Erstelle einen optimalen System-Prompt für einen AI-Agent basierend auf dieser Beschreibung:
+
+"{description}"
+
+Der System-Prompt soll den Agent perfekt für diese spezifische Aufgabe konfigurieren."""
+
+    def _generate_system_prompt(
+        self,
+        description: str,
+        llm_endpoint: str | None = None,
+        llm_api_key: str | None = None,
+        llm_model: str | None = None,
+        force_regenerate: bool = False,
+    ) -> tuple[str, bool]:
+        """Generiere intelligenten System-Prompt mit AI-Agent.
+
+        Liefert `(system_prompt, is_fallback)`.
+        """
+        try:
+            # Verwende AI-Agent auf der langlebigen LLM-Loop
+            return self._submit(
+                self._generate_system_prompt_ai(
+                    description,
+                    llm_endpoint=llm_endpoint,
+                    llm_api_key=llm_api_key,
+                    llm_model=llm_model,
+                    force_regenerate=force_regenerate,
+                )
+            ).result()
+        except Exception as e:
+            # Fallback falls AI-Agent nicht verfügbar
+            logger.warning(f"System-Prompt-Generierung fehlgeschlagen: {e}")
+            FALLBACKS.inc(reason=type(e).__name__)
+            return self._fallback_system_prompt(description), True
 
+    async def _agenerate_system_prompt(
+        self,
+        description: str,
+        llm_endpoint: str | None = None,
+        llm_api_key: str | None = None,
+        llm_model: str | None = None,
+        force_regenerate: bool = False,
+    ) -> tuple[str, bool]:
+        """Asynchrone Variante von `_generate_system_prompt` für laufende Loops."""
         try:
-            # Verwende AI-Agent für dynamische Prompt-Generierung
-            return asyncio.run(self._generate_system_prompt_ai(description))
+            return await asyncio.wrap_future(
+                self._submit(
+                    self._generate_system_prompt_ai(
+                        description,
+                        llm_endpoint=llm_endpoint,
+                        llm_api_key=llm_api_key,
+                        llm_model=llm_model,
+                        force_regenerate=force_regenerate,
+                    )
+                )
+            )
         except Exception as e:
             # Fallback falls AI-Agent nicht verfügbar
-            return f"""Du bist ein spezialisierter AI-Agent.
+            logger.warning(f"System-Prompt-Generierung fehlgeschlagen: {e}")
+            FALLBACKS.inc(reason=type(e).__name__)
+            return self._fallback_system_prompt(description), True
+
+    def _fallback_system_prompt(self, description: str) -> str:
+        """Einfacher System-Prompt, falls der Prompt-Engineer nicht erreichbar ist."""
+        return f"""Du bist ein spezialisierter AI-Agent.
 
 Aufgabe: {description}
 
 Führe deine Aufgabe professionell und präzise aus. Gib strukturierte, hilfreiche Antworten."""
 
-    def _generate_response_model(self, description: str) -> str:
-        """Generiere Pydantic Response Model basierend auf Beschreibung."""
-        return '''class AgentResponse(BaseModel):
-    """Response-Model für den generierten Agent."""
-    
-    response: str = Field(description="Die Hauptantwort des Agents")
-    status: str = Field(default="success", description="Status der Ausführung")
-    additional_info: Optional[dict] = Field(default=None, description="Zusätzliche Informationen")'''
-        return '''class AgentResponse(BaseModel):
-    """Response-Model für den generierten Agent."""
-    
-    response: str = Field(description="Die Hauptantwort des Agents")
-    status: str = Field(default="success", description="Status der Ausführung")
-    additional_info: Optional[dict] = Field(default=None, description="Zusätzliche Informationen")'''
+    def _generate_response_model(self, description: str) -> tuple[str, str]:
+        """Wähle ein zur Aufgabe passendes Response-Model und sein Streaming-Feld."""
+        normalized = PromptCache.normalize(description)
+        for keywords, text_field, response_model in RESPONSE_MODELS:
+            if any(keyword in normalized for keyword in keywords):
+                return response_model, text_field
+        text_field, response_model = DEFAULT_RESPONSE_MODEL
+        return response_model, text_field
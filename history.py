@@ -0,0 +1,142 @@
+"""
+Verlauf generierter Agenten
+
+Speichert pro Generierung die Eingaben (Beschreibung, Einstellungen) und die
+vom LLM abgeleiteten Teile (System-Prompt, Response-Model) in einer
+SQLite-Datei. Damit lässt sich ein Agent mit geänderten Einstellungen neu
+rendern, ohne den System-Prompt erneut beim LLM anzufragen.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from prompt_cache import PromptCache, default_cache_path
+
+
+def default_history_path() -> Path:
+    """Standard-Pfad der Verlaufsdatei (neben dem Prompt-Cache)."""
+    return default_cache_path().parent / "history.sqlite"
+
+
+class GenerationHistory:
+    """Verlauf der Generierungen in SQLite (oder nur im Speicher)."""
+
+    def __init__(self, path: str | Path | None = None, max_entries: int = 500):
+        """Initialisiere den Verlauf; `path=None` hält ihn nur im Speicher."""
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(path) if path is not None else ":memory:", check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS generations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                description TEXT NOT NULL,
+                description_key TEXT NOT NULL,
+                system_prompt TEXT NOT NULL,
+                response_model TEXT NOT NULL,
+                output_text_field TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                parent_id INTEGER
+            )"""
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS generations_description "
+            "ON generations (description_key, id)"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "GenerationHistory":
+        """Erstelle den Verlauf aus Umgebungsvariablen."""
+        path = os.getenv("GENERATION_HISTORY_PATH") or default_history_path()
+        if str(path).lower() in ("", "none", "off"):
+            path = None
+        return cls(
+            path=path,
+            max_entries=int(os.getenv("GENERATION_HISTORY_MAX_ENTRIES", "500")),
+        )
+
+    def add(
+        self,
+        description: str,
+        system_prompt: str,
+        response_model: str,
+        output_text_field: str,
+        settings: dict,
+        parent_id: int | None = None,
+    ) -> int:
+        """Speichere eine Generierung und liefere ihre ID."""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO generations (created_at, description, description_key, "
+                "system_prompt, response_model, output_text_field, settings, parent_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    description,
+                    PromptCache.normalize(description),
+                    system_prompt,
+                    response_model,
+                    output_text_field,
+                    json.dumps(settings, ensure_ascii=False),
+                    parent_id,
+                ),
+            )
+            self._db.execute(
+                "DELETE FROM generations WHERE id NOT IN "
+                "(SELECT id FROM generations ORDER BY id DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+            return cursor.lastrowid
+
+    def get(self, entry_id: int) -> dict | None:
+        """Lies einen Eintrag."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM generations WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return self._to_dict(row)
+
+    def latest(self, description: str) -> dict | None:
+        """Jüngster Eintrag zu einer (normalisierten) Beschreibung."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM generations WHERE description_key = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (PromptCache.normalize(description),),
+            ).fetchone()
+        return self._to_dict(row)
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        """Die jüngsten Einträge, neuester zuerst."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM generations ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def clear(self):
+        """Lösche den gesamten Verlauf."""
+        with self._lock:
+            self._db.execute("DELETE FROM generations")
+            self._db.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row | None) -> dict | None:
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["settings"] = json.loads(entry["settings"])
+        return entry
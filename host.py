@@ -0,0 +1,249 @@
+"""
+Agent-Host: viele generierte Agenten in einem Prozess
+
+Jede Agent-Datei eines Verzeichnisses wird unter `/<dateiname>/` eingehängt.
+Beim Start wird nur `AGENT_DEFINITION` per AST gelesen; Modul, A2A-App und
+Worker eines Agents entstehen erst bei der ersten Anfrage und werden nach
+einer Leerlaufzeit wieder entladen. Alle Agenten teilen sich über einen
+`LLMPool` die HTTP-Verbindungen zu ihren LLM-Endpoints.
+
+    python main.py host ./agents --port 8000
+"""
+
+import ast
+import asyncio
+import importlib.util
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from llm_pool import LLMPool
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_KEYS = ("system_prompt", "llm_endpoint", "llm_api_key", "llm_model")
+
+
+def _parse_agent_file(path: Path) -> ast.Module | None:
+    try:
+        return ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+
+def read_agent_definition(path: Path) -> dict | None:
+    """Lies `AGENT_DEFINITION` aus einer Agent-Datei, ohne sie auszuführen."""
+    tree = _parse_agent_file(path)
+    if tree is None:
+        return None
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "AGENT_DEFINITION"
+            for target in node.targets
+        ):
+            try:
+                definition = ast.literal_eval(node.value)
+            except ValueError:
+                return None
+            if isinstance(definition, dict) and all(
+                key in definition for key in DEFINITION_KEYS
+            ):
+                return definition
+    return None
+
+
+def defines_create_app(path: Path) -> bool:
+    """Hat die Agent-Datei eine A2A-App (`def create_app`)? Die CLI-Variante nicht."""
+    tree = _parse_agent_file(path)
+    return tree is not None and any(
+        isinstance(node, ast.FunctionDef) and node.name == "create_app"
+        for node in tree.body
+    )
+
+
+class HostedAgent:
+    """ASGI-App eines Agents, die sich bei der ersten Anfrage selbst lädt."""
+
+    def __init__(self, name: str, path: Path, definition: dict, pool: LLMPool):
+        self.name = name
+        self.path = path
+        self.definition = definition
+        self.pool = pool
+        self.app = None
+        self.module = None
+        self.last_used = 0.0
+        self.in_flight = 0
+        self._lock = asyncio.Lock()
+        self._stop: asyncio.Event | None = None
+        self._lifespan: asyncio.Task | None = None
+
+    async def __call__(self, scope, receive, send):
+        app = await self.activate()
+        self.in_flight += 1
+        try:
+            await app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    @property
+    def busy(self) -> bool:
+        """Laufen noch Anfragen oder A2A-Aufgaben mit Admission-Platz?"""
+        if self.in_flight:
+            return True
+        pending = getattr(self.module, "_admitted_tasks", None) or {}
+        return any(pending.values())
+
+    async def activate(self):
+        """Lade den Agent, falls er noch nicht aktiv ist."""
+        async with self._lock:
+            if self.app is None:
+                self.app = await self._start()
+            self.last_used = time.monotonic()
+            return self.app
+
+    def _load_module(self):
+        module_name = f"agent_fabric_hosted_{self.name}"
+        spec = importlib.util.spec_from_file_location(module_name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+    async def _start(self):
+        started = time.perf_counter()
+        module = self._load_module()
+
+        # Agent mit Model aus dem gemeinsamen Pool statt eigenem Provider
+        model = self.pool.model(
+            self.definition["llm_endpoint"],
+            self.definition["llm_api_key"],
+            self.definition["llm_model"],
+        )
+        module._agent = module.create_agent(model=model)
+        app = module.create_app()
+
+        # Lifespan (Task-Manager + Worker) läuft in eigenem Task bis zum Entladen
+        ready = asyncio.Event()
+        self._stop = asyncio.Event()
+
+        async def run_lifespan():
+            async with app.router.lifespan_context(app):
+                ready.set()
+                await self._stop.wait()
+
+        self._lifespan = asyncio.create_task(run_lifespan())
+        ready_wait = asyncio.ensure_future(ready.wait())
+        await asyncio.wait(
+            {self._lifespan, ready_wait}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not ready.is_set():
+            ready_wait.cancel()
+            lifespan, self._lifespan = self._lifespan, None
+            lifespan.result()
+        self.module = module
+
+        logger.info(
+            f"🟢 Agent {self.name} geladen ({time.perf_counter() - started:.2f}s)"
+        )
+        return app
+
+    async def stop(self):
+        """Beende Worker und Task-Manager und gib die App frei."""
+        async with self._lock:
+            if self._lifespan is None:
+                return
+            self._stop.set()
+            try:
+                await self._lifespan
+            finally:
+                self._lifespan = None
+                self.app = None
+                self.module = None
+                sys.modules.pop(f"agent_fabric_hosted_{self.name}", None)
+            logger.info(f"⚪ Agent {self.name} entladen")
+
+
+def discover_agents(agent_dir: str | Path, pool: LLMPool) -> dict[str, HostedAgent]:
+    """Finde alle generierten Agenten (mit `AGENT_DEFINITION`) in einem Verzeichnis."""
+    agents = {}
+    for path in sorted(Path(agent_dir).glob("*.py")):
+        definition = read_agent_definition(path)
+        if definition is None:
+            logger.warning(f"⚠️ {path.name}: keine AGENT_DEFINITION, übersprungen")
+            continue
+        if not defines_create_app(path):
+            logger.warning(
+                f"⚠️ {path.name}: kein Server-Modus (create_app), übersprungen"
+            )
+            continue
+        agents[path.stem] = HostedAgent(path.stem, path, definition, pool)
+    return agents
+
+
+def create_host_app(
+    agent_dir: str | Path,
+    idle_timeout: float = 1800,
+    pool: LLMPool | None = None,
+) -> Starlette:
+    """Erstelle die ASGI-App, die alle Agenten eines Verzeichnisses bereitstellt."""
+    pool = pool or LLMPool()
+    agents = discover_agents(agent_dir, pool)
+
+    async def index(request: Request):
+        return JSONResponse(
+            {
+                "agents": {
+                    name: {
+                        "path": f"/{name}/",
+                        "description": agent.definition.get("description", ""),
+                        "active": agent.app is not None,
+                    }
+                    for name, agent in agents.items()
+                },
+                "pool": pool.stats(),
+            }
+        )
+
+    async def evict_idle():
+        while True:
+            await asyncio.sleep(min(idle_timeout, 60))
+            now = time.monotonic()
+            for agent in agents.values():
+                if (
+                    agent.app is not None
+                    and not agent.busy
+                    and now - agent.last_used > idle_timeout
+                ):
+                    await agent.stop()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        evictor = asyncio.create_task(evict_idle()) if idle_timeout > 0 else None
+        try:
+            yield
+        finally:
+            if evictor is not None:
+                evictor.cancel()
+            for agent in agents.values():
+                await agent.stop()
+            await pool.aclose()
+
+    routes = [Route("/", index, methods=["GET"])]
+    routes += [Mount(f"/{name}", app=agent) for name, agent in agents.items()]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.agents = agents
+    app.state.pool = pool
+    return app
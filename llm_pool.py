@@ -0,0 +1,126 @@
+"""
+Pool für LLM-Verbindungen und Agenten pro Endpoint
+
+Ein HTTP-Client (Keep-Alive) pro Endpoint, ein Provider pro (Endpoint, Key)
+und ein Agent pro (Endpoint, Model, Key-Hash). Alles wird erst bei Bedarf
+angelegt und nach einer Leerlaufzeit wieder freigegeben.
+
+Der Pool ist nicht thread-safe und muss immer auf derselben Event-Loop
+verwendet werden, da die HTTP-Verbindungen an diese Loop gebunden sind.
+"""
+
+import hashlib
+import time
+from typing import Callable
+
+import httpx
+
+
+def key_hash(api_key: str) -> str:
+    """Kurzer Hash eines API-Schlüssels, damit Schlüssel nicht im Klartext als Key dienen."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMPool:
+    """Verwalte HTTP-Clients, Provider und Agenten für mehrere LLM-Endpoints."""
+
+    def __init__(
+        self,
+        agent_factory: Callable | None = None,
+        idle_timeout: float = 600,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        timeout: float = 600,
+        connect_timeout: float = 5,
+    ):
+        """Initialisiere den Pool; `agent_factory(model)` erzeugt die Agenten."""
+        self.agent_factory = agent_factory
+        self.idle_timeout = idle_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._providers: dict[tuple[str, str], object] = {}
+        self._agents: dict[tuple[str, str, str], object] = {}
+        self._last_used: dict[tuple[str, str, str], float] = {}
+
+    def http_client(self, endpoint: str) -> httpx.AsyncClient:
+        """Gemeinsamer Keep-Alive-Client für einen Endpoint."""
+        client = self._clients.get(endpoint)
+        if client is None:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._clients[endpoint] = client
+        return client
+
+    def provider(self, endpoint: str, api_key: str):
+        """OpenAI-kompatibler Provider für (Endpoint, Key)."""
+        from pydantic_ai.providers.openai import OpenAIProvider
+
+        key = (endpoint, key_hash(api_key))
+        provider = self._providers.get(key)
+        if provider is None:
+            provider = OpenAIProvider(
+                base_url=endpoint,
+                api_key=api_key,
+                http_client=self.http_client(endpoint),
+            )
+            self._providers[key] = provider
+        return provider
+
+    def model(self, endpoint: str, api_key: str, model_name: str):
+        """Erstelle ein Model auf Basis des gepoolten Providers."""
+        from pydantic_ai.models.openai import OpenAIModel
+
+        return OpenAIModel(
+            provider=self.provider(endpoint, api_key), model_name=model_name
+        )
+
+    async def get_agent(self, endpoint: str, api_key: str, model_name: str):
+        """Liefere den Agent für (Endpoint, Model, Key) und lege ihn bei Bedarf an."""
+        await self.evict_idle()
+
+        key = (endpoint, model_name, key_hash(api_key))
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self.agent_factory(self.model(endpoint, api_key, model_name))
+            self._agents[key] = agent
+        self._last_used[key] = time.monotonic()
+        return agent
+
+    async def evict_idle(self):
+        """Gib Agenten, Provider und Clients frei, die zu lange ungenutzt waren."""
+        now = time.monotonic()
+        for key, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout:
+                del self._agents[key]
+                del self._last_used[key]
+
+        used_providers = {(endpoint, khash) for endpoint, _, khash in self._agents}
+        for key in list(self._providers):
+            if key not in used_providers:
+                del self._providers[key]
+
+        used_endpoints = {endpoint for endpoint, _ in self._providers}
+        for endpoint in list(self._clients):
+            if endpoint not in used_endpoints:
+                await self._clients.pop(endpoint).aclose()
+
+    async def aclose(self):
+        """Schließe alle HTTP-Clients und leere den Pool."""
+        self._agents.clear()
+        self._last_used.clear()
+        self._providers.clear()
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def stats(self) -> dict:
+        """Anzahl aktiver Clients, Provider und Agenten."""
+        return {
+            "clients": len(self._clients),
+            "providers": len(self._providers),
+            "agents": len(self._agents),
+        }
@@ -3,11 +3,20 @@
 Agent Fabric - Generiere Custom Agents aus umgangssprachlichen Beschreibungen
 """
 
-import gradio as gr
+import argparse
+import csv
+import json
 import os
 import logging
+import time
+from dataclasses import asdict
 from pathlib import Path
-from generator import AgentGenerator
+from benchmarks.loadtest import add_arguments as add_loadtest_arguments
+from export import AgentExporter, normalize_filename
+from generator import DEFAULT_HTTP_SETTINGS, AgentGenerator
+from history import GenerationHistory
+from metrics import REGISTRY, setup_tracing, span
+from rate_limit import SessionRateLimiter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,73 +24,200 @@ logger = logging.getLogger(__name__)
 
 def create_agent_interface():
     """Erstelle die Gradio-Oberfläche für Agent Fabric."""
+    # Gradio erst hier laden: `main.py batch` braucht es nicht
+    import gradio as gr
 
-    generator = AgentGenerator()
+    generator = AgentGenerator(history=GenerationHistory.from_env())
+    exporter = AgentExporter()
+    rate_limiter = SessionRateLimiter.from_env()
 
-    def generate_agent_code(
+    # Generierungen laufen höchstens so oft parallel, wie das LLM-Backend verkraftet;
+    # alle weiteren warten sichtbar in der Gradio-Queue
+    generation_concurrency = int(
+        os.getenv("GRADIO_GENERATION_CONCURRENCY", str(generator.max_concurrency))
+    )
+
+    REGISTRY.gauge(
+        "agent_fabric_prompt_cache_hit_rate",
+        "Trefferquote des System-Prompt-Caches",
+        lambda: generator.prompt_cache.stats()["hit_rate"],
+    )
+    REGISTRY.gauge(
+        "agent_fabric_prompt_engineer_agents",
+        "Aktive Prompt-Engineer-Agenten im Pool",
+        lambda: generator.llm_pool.stats()["agents"],
+    )
+    REGISTRY.gauge(
+        "agent_fabric_llm_waiting",
+        "Prompt-Engineer-Aufrufe, die auf einen freien LLM-Platz warten",
+        lambda: generator.llm_stats()["waiting"],
+    )
+    REGISTRY.gauge(
+        "agent_fabric_rate_limited_requests",
+        "Wegen Rate-Limit abgelehnte Generierungen seit dem Start",
+        lambda: rate_limiter.stats()["rejected"],
+    )
+
+    async def generate_agent_code(
+        request: gr.Request,
         description: str,
         use_mcp: bool,
         llm_endpoint: str,
         llm_api_key: str,
         llm_model: str,
+        force_regenerate: bool,
+        template_name: str,
+        response_cache: bool,
+        micro_batching: bool,
+        filename: str,
+        *http_values,
     ):
-        """Generiere Agent-Code basierend auf Beschreibung."""
+        """Generiere Agent-Code und streame Zwischenstände in die Code-Ansicht."""
         try:
             if not description.strip():
-                return "", "❌ Bitte beschreiben Sie, was Ihr Agent können soll."
+                yield "", "❌ Bitte beschreiben Sie, was Ihr Agent können soll."
+                return
+
+            wait = rate_limiter.acquire(request.session_hash if request else "")
+            if wait:
+                yield (
+                    gr.update(),
+                    f"⏳ Zu viele Generierungen, bitte in {wait:.0f} s erneut versuchen.",
+                )
+                return
 
-            code = generator.generate_agent(
+            code = ""
+            async for code in generator.astream_agent(
                 description=description,
                 use_mcp=use_mcp,
                 llm_endpoint=llm_endpoint,
                 llm_api_key=llm_api_key,
                 llm_model=llm_model,
-                filename="mein_agent.py",
+                filename=normalize_filename(filename),
+                force_regenerate=force_regenerate,
+                template_name=template_name,
+                response_cache=response_cache,
+                micro_batching=micro_batching,
+                http_settings=dict(zip(DEFAULT_HTTP_SETTINGS, http_values)),
+            ):
+                yield code, "⏳ System-Prompt wird generiert..."
+
+            stats = generator.prompt_cache.stats()
+            yield (
+                code,
+                f"✅ Agent erfolgreich generiert! "
+                f"(Prompt-Cache: {stats['hits']} Treffer, {stats['misses']} Fehlversuche)",
             )
-            return code, "✅ Agent erfolgreich generiert!"
         except Exception as e:
             logger.error(f"Fehler bei der Agent-Generierung: {e}")
-            return "", f"❌ Fehler: {str(e)}"
+            yield "", f"❌ Fehler: {str(e)}"
 
-    def save_agent_code(code: str, filename: str):
-        """Speichere den generierten Code in eine .py Datei."""
-        if not code.strip():
-            return "❌ Fehler: Kein Code zum Speichern vorhanden.", None, None
-
-        if not filename.endswith(".py"):
-            filename += ".py"
+    def rerender_entry(
+        entry_id,
+        use_mcp: bool,
+        llm_endpoint: str,
+        llm_api_key: str,
+        llm_model: str,
+        template_name: str,
+        response_cache: bool,
+        micro_batching: bool,
+        filename: str,
+        *http_values,
+    ):
+        """Rendere einen Verlaufseintrag mit den aktuellen Einstellungen neu."""
+        if entry_id is None:
+            return gr.update(), "❌ Bitte zuerst einen Eintrag im Verlauf auswählen."
 
+        started = time.perf_counter()
         try:
-            # Agent-Code mit korrektem Dateinamen regenerieren
-            import re
+            code, new_id = generator.rerender_agent(
+                int(entry_id),
+                llm_api_key=llm_api_key,
+                use_mcp=use_mcp,
+                llm_endpoint=llm_endpoint,
+                llm_model=llm_model,
+                template_name=template_name,
+                response_cache=response_cache,
+                micro_batching=micro_batching,
+                filename=normalize_filename(filename),
+                http_settings=dict(zip(DEFAULT_HTTP_SETTINGS, http_values)),
+            )
+        except Exception as e:
+            return gr.update(), f"❌ Fehler beim Neu-Rendern: {str(e)}"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return (
+            code,
+            f"✅ Neu gerendert in {elapsed_ms:.0f} ms ohne LLM-Aufruf "
+            f"(Verlaufseintrag #{new_id})",
+        )
 
-            updated_code = re.sub(
-                r"python [^\.]*\.py server", f"python {filename} server", code
+    def rerender_latest(description: str, *settings):
+        """Rendere die letzte Generierung dieser Beschreibung neu."""
+        entry = generator.history.latest(description or "")
+        if entry is None:
+            return (
+                gr.update(),
+                "❌ Für diese Beschreibung gibt es noch keinen Verlauf. "
+                "Bitte zuerst generieren.",
             )
+        return rerender_entry(entry["id"], *settings)
+
+    def load_history():
+        """Tabelle der letzten Generierungen."""
+        return [
+            [
+                entry["id"],
+                time.strftime("%d.%m. %H:%M", time.localtime(entry["created_at"])),
+                entry["description"],
+                entry["settings"].get("template_name", "standard"),
+                entry["settings"].get("llm_model", ""),
+                entry["parent_id"] or "",
+            ]
+            for entry in generator.history.recent()
+        ]
+
+    def show_history_entry(evt: gr.SelectData):
+        """Zeige System-Prompt und Einstellungen eines Eintrags."""
+        entry = generator.history.get(int(evt.row_value[0]))
+        if entry is None:
+            return None, "", ""
+        return (
+            entry["id"],
+            entry["system_prompt"],
+            json.dumps(entry["settings"], indent=2, ensure_ascii=False),
+        )
 
-            # Agent-Code speichern
-            output_path = Path(filename)
-            output_path.write_text(updated_code, encoding="utf-8")
-
-            # requirements.txt im gleichen Verzeichnis erstellen
-            req_path = output_path.parent / "requirements.txt"
-            requirements_content = """# Dependencies für generierten Agent
-pydantic-ai>=0.0.52
-pydantic-ai-slim[a2a]>=0.0.52
-fasta2a>=0.1.0
-fastapi>=0.115.12
-uvicorn>=0.34.0
-httpx>=0.27.0
-pydantic[email]>=2.11.3
-"""
-            req_path.write_text(requirements_content, encoding="utf-8")
+    def save_agent_code(
+        code: str,
+        filename: str,
+        template_name: str,
+        bundle: bool,
+        request: gr.Request,
+    ):
+        """Exportiere den Code in das Verzeichnis der Sitzung (optional als ZIP)."""
+        if not code.strip():
+            return "❌ Fehler: Kein Code zum Speichern vorhanden.", None
 
-            status_msg = f"✅ Agent gespeichert als: {output_path.absolute()}\n✅ Requirements erstellt: {req_path.absolute()}"
+        # Der Dateiname ist bereits beim Rendern in den Code eingesetzt
+        filename = normalize_filename(filename)
 
-            # Return files for download
-            return status_msg, str(output_path), str(req_path)
+        try:
+            with span("save_agent_code"):
+                result = exporter.export(
+                    code,
+                    filename,
+                    session_id=request.session_hash,
+                    template_name=template_name,
+                    bundle=bundle,
+                )
         except Exception as e:
-            return f"❌ Fehler beim Speichern: {str(e)}", None, None
+            return f"❌ Fehler beim Speichern: {str(e)}", None
+
+        if result.bundle_path is not None:
+            status_msg = f"✅ Bundle erstellt: {result.bundle_path.name} (Agent, requirements.txt, Dockerfile)"
+        else:
+            status_msg = f"✅ Agent gespeichert als: {result.agent_path.name}\n✅ Requirements erstellt: {result.requirements_path.name}"
+        return status_msg, result
 
     # Gradio Interface
     with gr.Blocks(title="🤖 Agent Fabric", theme=gr.themes.Soft()) as interface:
@@ -107,8 +243,45 @@ pydantic[email]>=2.11.3
                             info="Aktiviert den Zugriff auf externe Funktionen",
                         )
 
-                        generate_btn = gr.Button(
-                            "✨ Agent generieren", variant="primary", size="lg"
+                        force_regenerate = gr.Checkbox(
+                            label="🔄 System-Prompt neu generieren",
+                            value=False,
+                            info="Ignoriert den Prompt-Cache und fragt das LLM erneut",
+                        )
+
+                        response_cache = gr.Checkbox(
+                            label="⚡ Antworten im Agent cachen",
+                            value=False,
+                            info="Wiederholte Eingaben beantwortet der Agent ohne LLM-Aufruf",
+                        )
+
+                        micro_batching = gr.Checkbox(
+                            label="📦 Gleichzeitige Anfragen bündeln",
+                            value=False,
+                            info="Für kurze Eingaben in großer Zahl, z.B. Bewertungen klassifizieren",
+                        )
+
+                        template_name = gr.Dropdown(
+                            label="🧩 Agent-Variante",
+                            choices=[
+                                ("Standard (interaktiv + Server)", "standard"),
+                                ("Nur Kommandozeile", "cli"),
+                                ("Nur A2A-Server", "server"),
+                                ("Mit externen Tools (MCP)", "mcp"),
+                            ],
+                            value="standard",
+                        )
+
+                        with gr.Row():
+                            generate_btn = gr.Button(
+                                "✨ Agent generieren", variant="primary", size="lg"
+                            )
+                            rerender_btn = gr.Button(
+                                "⚡ Nur neu rendern", variant="secondary", size="lg"
+                            )
+                        gr.Markdown(
+                            "*Nur neu rendern* übernimmt geänderte Einstellungen "
+                            "ohne neuen LLM-Aufruf (System-Prompt aus dem Verlauf)."
                         )
 
                     with gr.Column(scale=1):
@@ -122,10 +295,16 @@ pydantic[email]>=2.11.3
 
                         with gr.Row():
                             filename_input = gr.Textbox(
-                                label="Speichern als", value="mein_agent.py"
+                                label="Speichern als",
+                                value="mein_agent.py",
+                                info="Wird beim Generieren bzw. Neu-Rendern in den Code eingesetzt",
                             )
                             save_btn = gr.Button("💾 Speichern")
 
+                        export_bundle = gr.Checkbox(
+                            label="📦 Als ZIP-Bundle (Agent, requirements.txt, Dockerfile)",
+                            value=False,
+                        )
                         save_status = gr.Textbox(label="", interactive=False)
 
                         # Download Buttons
@@ -136,6 +315,9 @@ pydantic[email]>=2.11.3
                             requirements_download = gr.DownloadButton(
                                 label="📥 Requirements herunterladen", visible=False
                             )
+                            bundle_download = gr.DownloadButton(
+                                label="📦 Bundle herunterladen", visible=False
+                            )
 
             # Tab 2: Erweiterte Einstellungen
             with gr.TabItem("⚙️ Einstellungen"):
@@ -172,7 +354,99 @@ pydantic[email]>=2.11.3
                         - **OpenAI:** `https://api.openai.com/v1`
                         """)
 
-            # Tab 3: Beispiele
+                gr.Markdown("### HTTP-Verbindungen der generierten Agenten")
+                gr.Markdown(
+                    "Verbindungspool, Timeouts und Wiederholungen für die Anfragen "
+                    "des Agents an das LLM. Im Agent per `AGENT_HTTP_*` überschreibbar."
+                )
+                with gr.Row():
+                    with gr.Column():
+                        http_max_connections = gr.Number(
+                            label="Max. Verbindungen",
+                            value=DEFAULT_HTTP_SETTINGS["max_connections"],
+                            precision=0,
+                            minimum=1,
+                        )
+                        http_max_keepalive = gr.Number(
+                            label="Max. Keep-Alive-Verbindungen",
+                            value=DEFAULT_HTTP_SETTINGS["max_keepalive_connections"],
+                            precision=0,
+                            minimum=0,
+                        )
+                        http_keepalive_expiry = gr.Number(
+                            label="Keep-Alive-Dauer (s)",
+                            value=DEFAULT_HTTP_SETTINGS["keepalive_expiry"],
+                            minimum=0,
+                        )
+                        http2 = gr.Checkbox(
+                            label="HTTP/2",
+                            value=DEFAULT_HTTP_SETTINGS["http2"],
+                            info="Mehrere Anfragen über eine Verbindung (benötigt h2)",
+                        )
+                    with gr.Column():
+                        http_connect_timeout = gr.Number(
+                            label="Verbindungs-Timeout (s)",
+                            value=DEFAULT_HTTP_SETTINGS["connect_timeout"],
+                            minimum=0,
+                        )
+                        http_read_timeout = gr.Number(
+                            label="Lese-Timeout (s)",
+                            value=DEFAULT_HTTP_SETTINGS["read_timeout"],
+                            minimum=0,
+                        )
+                        http_max_retries = gr.Number(
+                            label="Wiederholungen",
+                            value=DEFAULT_HTTP_SETTINGS["max_retries"],
+                            precision=0,
+                            minimum=0,
+                            info="Bei Verbindungsfehlern, 429 und 5xx",
+                        )
+                        http_retry_backoff = gr.Number(
+                            label="Backoff-Basis (s)",
+                            value=DEFAULT_HTTP_SETTINGS["retry_backoff"],
+                            minimum=0,
+                            info="Wartezeit zufällig bis Basis × 2^Versuch",
+                        )
+
+            # Tab 3: Verlauf
+            with gr.TabItem("📜 Verlauf"):
+                gr.Markdown("### Bisher generierte Agenten")
+                gr.Markdown(
+                    "Eintrag auswählen und mit den aktuellen Einstellungen neu "
+                    "rendern. Der System-Prompt wird wiederverwendet, es gibt "
+                    "keinen LLM-Aufruf."
+                )
+                history_table = gr.Dataframe(
+                    headers=[
+                        "ID",
+                        "Zeit",
+                        "Beschreibung",
+                        "Variante",
+                        "Model",
+                        "Basis",
+                    ],
+                    datatype=["number", "str", "str", "str", "str", "str"],
+                    value=load_history,
+                    interactive=False,
+                    wrap=True,
+                )
+                with gr.Row():
+                    history_refresh_btn = gr.Button("🔄 Aktualisieren")
+                    history_id = gr.Number(
+                        label="Ausgewählter Eintrag", precision=0, interactive=False
+                    )
+                    history_rerender_btn = gr.Button(
+                        "⚡ Mit aktuellen Einstellungen neu rendern", variant="primary"
+                    )
+                with gr.Row():
+                    history_prompt = gr.Textbox(
+                        label="System-Prompt", lines=10, interactive=False
+                    )
+                    history_settings = gr.Code(
+                        label="Einstellungen", language="json", interactive=False
+                    )
+
+            # Tab 4: Beispiele
             with gr.TabItem("💡 Beispiele"):
                 gr.Markdown("### Klicken Sie auf ein Beispiel, um es auszuprobieren")
 
@@ -200,7 +474,7 @@ pydantic[email]>=2.11.3
                             outputs=[description, use_mcp],
                         )
 
-            # Tab 4: Hilfe
+            # Tab 5: Hilfe
             with gr.TabItem("❓ Hilfe"):
                 gr.Markdown("""
                 ## Wie funktioniert Agent Fabric?
@@ -221,7 +495,7 @@ pydantic[email]>=2.11.3
                 
                 **Mit uv (empfohlen):**
                 ```bash
-                uv add pydantic-ai pydantic-ai-slim[a2a] fasta2a fastapi uvicorn
+                uv add -r requirements.txt
                 python mein_agent.py
                 ```
                 
@@ -254,56 +528,341 @@ pydantic[email]>=2.11.3
                 """)
 
         # Event Handler (außerhalb der Tabs)
+        # Reihenfolge wie in DEFAULT_HTTP_SETTINGS
+        http_inputs = [
+            http_max_connections,
+            http_max_keepalive,
+            http_keepalive_expiry,
+            http2,
+            http_connect_timeout,
+            http_read_timeout,
+            http_max_retries,
+            http_retry_backoff,
+        ]
+        render_inputs = [
+            use_mcp,
+            llm_endpoint,
+            llm_api_key,
+            llm_model,
+            template_name,
+            response_cache,
+            micro_batching,
+            filename_input,
+            *http_inputs,
+        ]
+
         generate_btn.click(
             generate_agent_code,
-            inputs=[description, use_mcp, llm_endpoint, llm_api_key, llm_model],
+            inputs=[
+                description,
+                use_mcp,
+                llm_endpoint,
+                llm_api_key,
+                llm_model,
+                force_regenerate,
+                template_name,
+                response_cache,
+                micro_batching,
+                filename_input,
+                *http_inputs,
+            ],
             outputs=[code_output, status_output],
-        )
+            # Wartende Nutzer sehen ihre Queue-Position; Mehrfachklicks werden ignoriert
+            concurrency_limit=generation_concurrency,
+            concurrency_id="generation",
+            trigger_mode="once",
+            show_progress="full",
+        ).then(load_history, outputs=history_table)
+
+        rerender_btn.click(
+            rerender_latest,
+            inputs=[description, *render_inputs],
+            outputs=[code_output, status_output],
+        ).then(load_history, outputs=history_table)
 
-        def handle_save_and_download(code, filename):
-            """Handle save and show download buttons."""
-            status, agent_path, req_path = save_agent_code(code, filename)
+        history_refresh_btn.click(load_history, outputs=history_table)
+        history_table.select(
+            show_history_entry,
+            outputs=[history_id, history_prompt, history_settings],
+        )
+        history_rerender_btn.click(
+            rerender_entry,
+            inputs=[history_id, *render_inputs],
+            outputs=[code_output, status_output],
+        ).then(load_history, outputs=history_table)
+
+        def handle_save_and_download(
+            code, filename, template_name, bundle, request: gr.Request
+        ):
+            """Exportiere und zeige die passenden Download-Buttons."""
+            status, result = save_agent_code(
+                code, filename, template_name, bundle, request
+            )
+            hidden = gr.DownloadButton(visible=False)
 
-            if agent_path and req_path:
+            if result is None:
+                return status, hidden, hidden, hidden
+            if result.bundle_path is not None:
                 return (
                     status,
+                    hidden,
+                    hidden,
                     gr.DownloadButton(
-                        label="📥 Agent herunterladen", value=agent_path, visible=True
-                    ),
-                    gr.DownloadButton(
-                        label="📥 Requirements herunterladen",
-                        value=req_path,
+                        label="📦 Bundle herunterladen",
+                        value=str(result.bundle_path),
                         visible=True,
                     ),
                 )
-            else:
-                return (
-                    status,
-                    gr.DownloadButton(visible=False),
-                    gr.DownloadButton(visible=False),
-                )
+            return (
+                status,
+                gr.DownloadButton(
+                    label="📥 Agent herunterladen",
+                    value=str(result.agent_path),
+                    visible=True,
+                ),
+                gr.DownloadButton(
+                    label="📥 Requirements herunterladen",
+                    value=str(result.requirements_path),
+                    visible=True,
+                ),
+                hidden,
+            )
 
         save_btn.click(
             handle_save_and_download,
-            inputs=[code_output, filename_input],
-            outputs=[save_status, agent_download, requirements_download],
+            inputs=[code_output, filename_input, template_name, export_bundle],
+            outputs=[
+                save_status,
+                agent_download,
+                requirements_download,
+                bundle_download,
+            ],
         )
 
+        # Export-Verzeichnis der Sitzung beim Schließen entfernen
+        def cleanup_session(request: gr.Request):
+            exporter.cleanup(request.session_hash)
+
+        interface.unload(cleanup_session)
+
+    # Kurze Events (Rendern, Speichern, Verlauf) teilen sich ein eigenes Limit
+    interface.queue(
+        default_concurrency_limit=int(os.getenv("GRADIO_CONCURRENCY", "16")),
+        max_size=int(os.getenv("GRADIO_MAX_QUEUE", "64")),
+    )
+
     return interface
 
 
+def create_app(interface):
+    """Binde die Gradio-Oberfläche zusammen mit `/metrics` in eine FastAPI-App ein."""
+    import gradio as gr
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI(title="Agent Fabric")
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
+    return gr.mount_gradio_app(app, interface, path="/", show_error=True)
+
+
+def load_batch_items(path: str) -> list[dict]:
+    """Lies Agent-Beschreibungen aus einer .jsonl- oder .csv-Datei.
+
+    JSONL: pro Zeile ein Objekt mit `description` (optional `filename`,
+    `use_mcp`, `template_name`, `response_cache`, `micro_batching`) oder ein
+    einfacher String.
+    CSV: Kopfzeile mit denselben Spaltennamen.
+    """
+    path = Path(path)
+    items = []
+
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                for flag in ("use_mcp", "response_cache", "micro_batching"):
+                    row[flag] = str(row.get(flag, "")).strip().lower() in (
+                        "1",
+                        "true",
+                        "yes",
+                        "ja",
+                    )
+                items.append(row)
+    else:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if isinstance(item, str):
+                    item = {"description": item}
+                items.append(item)
+
+    return [item for item in items if str(item.get("description", "")).strip()]
+
+
+def run_batch(args):
+    """Generiere Agenten aus einer Datei und gib einen Bericht aus."""
+    items = load_batch_items(args.input)
+    if not items:
+        logger.error(f"❌ Keine Beschreibungen in {args.input} gefunden")
+        return 1
+
+    for flag in ("response_cache", "micro_batching"):
+        if getattr(args, flag):
+            for item in items:
+                item[flag] = True
+
+    # Die Batch-Parallelität ist auch die Obergrenze für LLM-Aufrufe
+    generator = AgentGenerator(max_concurrency=args.concurrency)
+    started = time.perf_counter()
+    results = generator.generate_batch(
+        items,
+        args.output_dir,
+        concurrency=args.concurrency,
+        llm_endpoint=args.endpoint,
+        llm_api_key=args.api_key,
+        llm_model=args.model,
+        force_regenerate=args.force_regenerate,
+    )
+    total = time.perf_counter() - started
+    generator.close()
+
+    icons = {"ok": "✅", "fallback": "⚠️", "error": "❌"}
+    for result in results:
+        line = f"{icons[result.status]} {result.latency:6.2f}s  {result.filename}"
+        if result.error:
+            line += f"  ({result.error})"
+        print(line)
+
+    failed = [r for r in results if r.status != "ok"]
+    print(
+        f"\n{len(results)} Agenten in {total:.2f}s "
+        f"({len(results) / total:.2f}/s), {len(failed)} mit Fehlern"
+    )
+
+    report_path = Path(args.output_dir) / "batch_report.json"
+    report_path.write_text(
+        json.dumps(
+            {
+                "total_seconds": total,
+                "concurrency": args.concurrency,
+                "results": [asdict(r) for r in results],
+            },
+            indent=2,
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Bericht: {report_path.absolute()}")
+
+    return 1 if any(r.status == "error" for r in results) else 0
+
+
+def run_host(args):
+    """Stelle alle Agenten eines Verzeichnisses unter eigenen Pfaden bereit."""
+    import uvicorn
+
+    from host import create_host_app
+
+    app = create_host_app(args.agent_dir, idle_timeout=args.idle_timeout)
+    agents = app.state.agents
+    if not agents:
+        logger.error(f"❌ Keine generierten Agenten in {args.agent_dir} gefunden")
+        return 1
+
+    logger.info(f"🏠 Agent-Host mit {len(agents)} Agenten auf {args.host}:{args.port}")
+    for name in agents:
+        logger.info(f"   http://{args.host}:{args.port}/{name}/")
+
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
 def main():
     """Starte die Agent Fabric Anwendung."""
+    parser = argparse.ArgumentParser(description="Agent Fabric")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch", help="Viele Agenten aus einer .jsonl/.csv-Datei generieren"
+    )
+    batch.add_argument("input", help="Datei mit Agent-Beschreibungen")
+    batch.add_argument("output_dir", help="Zielverzeichnis für die Agenten")
+    batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("BATCH_CONCURRENCY", "4")),
+        help="Maximale Anzahl gleichzeitiger LLM-Anfragen",
+    )
+    batch.add_argument("--endpoint", default=os.getenv("LLM_ENDPOINT"))
+    batch.add_argument("--model", default=os.getenv("LLM_MODEL"))
+    batch.add_argument("--api-key", default=os.getenv("LLM_API_KEY"))
+    batch.add_argument(
+        "--force-regenerate",
+        action="store_true",
+        help="Prompt-Cache ignorieren",
+    )
+    batch.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="Antwort-Cache in alle generierten Agenten einbauen",
+    )
+    batch.add_argument(
+        "--micro-batching",
+        action="store_true",
+        help="Micro-Batching in alle generierten Agenten einbauen",
+    )
+
+    host_parser = subparsers.add_parser(
+        "host", help="Alle Agenten eines Verzeichnisses in einem Server bereitstellen"
+    )
+    host_parser.add_argument("agent_dir", help="Verzeichnis mit generierten Agenten")
+    host_parser.add_argument("--host", default=os.getenv("AGENT_HOST", "127.0.0.1"))
+    host_parser.add_argument(
+        "--port", type=int, default=int(os.getenv("AGENT_PORT", "8000"))
+    )
+    host_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=float(os.getenv("AGENT_HOST_IDLE_TIMEOUT", "1800")),
+        help="Sekunden ohne Anfrage, nach denen ein Agent entladen wird (0 = nie)",
+    )
+
+    loadtest = subparsers.add_parser(
+        "loadtest",
+        help="Lasttest eines generierten Agent-Servers gegen ein Mock-LLM",
+    )
+    add_loadtest_arguments(loadtest)
+
+    args = parser.parse_args()
+    if args.command == "batch":
+        return run_batch(args)
+    if args.command == "host":
+        return run_host(args)
+    if args.command == "loadtest":
+        from benchmarks.loadtest import run as run_loadtest
+
+        return run_loadtest(args)
+
     host = os.getenv("GRADIO_HOST", "127.0.0.1")
     port = int(os.getenv("GRADIO_PORT", "7860"))
 
     logger.info(f"🚀 Agent Fabric startet auf {host}:{port}")
+    logger.info(f"📊 Metriken: http://{host}:{port}/metrics")
 
-    interface = create_agent_interface()
-    interface.launch(
-        server_name=host, server_port=port, share=False, debug=False, show_error=True
-    )
+    import uvicorn
+
+    setup_tracing()
+    app = create_app(create_agent_interface())
+    uvicorn.run(app, host=host, port=port)
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
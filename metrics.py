@@ -0,0 +1,251 @@
+"""
+Leichtgewichtige Metriken im Prometheus-Textformat und optionales Tracing
+
+`span("name")` misst die Dauer eines Abschnitts (Histogramm + Fehlerzähler)
+und erzeugt zusätzlich einen OpenTelemetry-Span, wenn Tracing aktiv ist.
+Tracing wird mit `setup_tracing()` eingeschaltet, sobald
+`OTEL_EXPORTER_OTLP_ENDPOINT` gesetzt und das OpenTelemetry-SDK installiert ist.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_labels(labelnames: tuple, values: tuple) -> str:
+    """Labels im Prometheus-Format, z.B. `{span="render"}`."""
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """Monoton steigender Zähler mit optionalen Labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Erhöhe den Zähler."""
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Aktueller Wert für eine Label-Kombination."""
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+                )
+        return lines
+
+
+class Histogram:
+    """Histogramm mit festen Buckets (Sekunden)."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Erfasse einen Messwert."""
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.labelnames + ("le",), key + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    """Momentanwert, der beim Auslesen über eine Callback-Funktion ermittelt wird."""
+
+    def __init__(self, name: str, documentation: str, callback):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        try:
+            value = self.callback()
+        except Exception as e:
+            logger.warning(f"Gauge {self.name} nicht lesbar: {e}")
+            return []
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {value}",
+        ]
+
+
+class MetricsRegistry:
+    """Sammlung aller Metriken eines Prozesses."""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()):
+        """Lege einen Zähler an."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = ()):
+        """Lege ein Histogramm an."""
+        return self._register(Histogram(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, callback):
+        """Registriere einen Gauge (ersetzt einen gleichnamigen)."""
+        return self._register(Gauge(name, documentation, callback))
+
+    def render(self) -> str:
+        """Alle Metriken im Prometheus-Textformat."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+SPAN_DURATION = REGISTRY.histogram(
+    "agent_fabric_span_duration_seconds",
+    "Dauer instrumentierter Abschnitte",
+    ("span",),
+)
+SPAN_ERRORS = REGISTRY.counter(
+    "agent_fabric_span_errors_total",
+    "Abschnitte, die mit einer Exception endeten",
+    ("span",),
+)
+FALLBACKS = REGISTRY.counter(
+    "agent_fabric_system_prompt_fallbacks_total",
+    "Generierungen, die auf den einfachen Fallback-Prompt ausweichen mussten",
+    ("reason",),
+)
+PROMPT_CACHE_LOOKUPS = REGISTRY.counter(
+    "agent_fabric_prompt_cache_lookups_total",
+    "Zugriffe auf den System-Prompt-Cache",
+    ("result",),
+)
+
+_tracer = None
+
+
+def setup_tracing(service_name: str = "agent-fabric") -> bool:
+    """Aktiviere OpenTelemetry-Export per OTLP, falls konfiguriert und installiert."""
+    global _tracer
+
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT gesetzt, aber OpenTelemetry fehlt: "
+            "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"
+        )
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create(
+            {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+        )
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("agent_fabric")
+
+    # LLM-Aufrufe von pydantic-ai ebenfalls tracen
+    from pydantic_ai import Agent
+
+    Agent.instrument_all()
+
+    logger.info("📡 OpenTelemetry-Tracing aktiv")
+    return True
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Miss einen Abschnitt und erzeuge bei aktivem Tracing einen Span."""
+    with ExitStack() as stack:
+        if _tracer is not None:
+            stack.enter_context(
+                _tracer.start_as_current_span(name, attributes=attributes)
+            )
+
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            SPAN_ERRORS.inc(span=name)
+            raise
+        finally:
+            SPAN_DURATION.observe(time.perf_counter() - started, span=name)
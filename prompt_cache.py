@@ -0,0 +1,183 @@
+"""
+Persistenter Cache für KI-generierte System-Prompts
+
+Zwei Stufen: ein LRU-Cache im Speicher vor einer SQLite-Datei auf der Platte.
+Einträge laufen nach einer TTL ab, beide Stufen sind in der Größe begrenzt.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def default_cache_path() -> Path:
+    """Standard-Pfad der Cache-Datei (XDG-Cache-Verzeichnis)."""
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "agent_fabric" / "system_prompts.sqlite"
+
+
+class PromptCache:
+    """Zweistufiger Cache (Speicher-LRU + SQLite) für generierte System-Prompts."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float = 7 * 24 * 3600,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 5000,
+    ):
+        """Initialisiere den Cache; `path=None` deaktiviert die Disk-Stufe."""
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS prompts (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "PromptCache":
+        """Erstelle den Cache aus Umgebungsvariablen."""
+        path = os.getenv("PROMPT_CACHE_PATH") or default_cache_path()
+        if str(path).lower() in ("", "none", "off"):
+            path = None
+        return cls(
+            path=path,
+            ttl=float(os.getenv("PROMPT_CACHE_TTL", "604800")),
+            max_memory_entries=int(os.getenv("PROMPT_CACHE_MEMORY_ENTRIES", "256")),
+            max_disk_entries=int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "5000")),
+        )
+
+    @staticmethod
+    def normalize(description: str) -> str:
+        """Normalisiere eine Beschreibung (Whitespace und Groß-/Kleinschreibung)."""
+        return " ".join(description.split()).casefold()
+
+    @classmethod
+    def make_key(cls, description: str, engineer_prompt: str, model: str) -> str:
+        """Bilde den inhaltsadressierten Schlüssel für einen System-Prompt."""
+        digest = hashlib.sha256()
+        for part in (cls.normalize(description), engineer_prompt, model):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Lies einen Eintrag; abgelaufene Einträge zählen als Fehlversuch."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._touch(key, now)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM prompts WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if now - created_at <= self.ttl:
+                        self._touch(key, now)
+                        self._remember(key, created_at, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM prompts WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """Speichere einen Eintrag in beiden Stufen."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO prompts (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._db.execute(
+                    "DELETE FROM prompts WHERE created_at < ?", (now - self.ttl,)
+                )
+                self._db.execute(
+                    "DELETE FROM prompts WHERE key NOT IN "
+                    "(SELECT key FROM prompts ORDER BY accessed_at DESC LIMIT ?)",
+                    (self.max_disk_entries,),
+                )
+                self._db.commit()
+
+    def _touch(self, key: str, now: float):
+        """Frische den Zugriffszeitpunkt auf der Platte auf (Basis der Verdrängung)."""
+        if self._db is not None:
+            self._db.execute(
+                "UPDATE prompts SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, created_at: float, value: str):
+        """Lege einen Eintrag im Speicher-LRU ab und verdränge den ältesten."""
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Leere beide Stufen."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM prompts")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Liefere Treffer-/Fehlversuch-Zähler und Füllstände."""
+        with self._lock:
+            disk_entries = 0
+            if self._db is not None:
+                disk_entries = self._db.execute(
+                    "SELECT COUNT(*) FROM prompts"
+                ).fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / total if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
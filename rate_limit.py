@@ -0,0 +1,58 @@
+"""
+Rate-Limit pro Sitzung für die Agent-Fabric-Oberfläche
+
+Gleitendes Zeitfenster: je Schlüssel (z.B. Gradio-Session) höchstens
+`max_requests` Anfragen in `window` Sekunden.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+
+class SessionRateLimiter:
+    """Begrenzt Anfragen pro Sitzung in einem gleitenden Zeitfenster."""
+
+    def __init__(self, max_requests: int, window: float = 60.0):
+        """`max_requests=0` schaltet die Begrenzung ab."""
+        self.max_requests = max_requests
+        self.window = window
+        self.rejected = 0
+        self._requests: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SessionRateLimiter":
+        """Erstelle den Limiter aus Umgebungsvariablen."""
+        return cls(
+            max_requests=int(os.getenv("GRADIO_RATE_LIMIT", "10")),
+            window=float(os.getenv("GRADIO_RATE_WINDOW", "60")),
+        )
+
+    def acquire(self, key: str) -> float:
+        """Zähle eine Anfrage; liefert 0 oder die Wartezeit bis zur nächsten."""
+        if self.max_requests <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            # Sitzungen ohne Anfragen im Fenster fallen heraus
+            for other in list(self._requests):
+                stamps = self._requests[other]
+                while stamps and now - stamps[0] >= self.window:
+                    stamps.popleft()
+                if not stamps:
+                    del self._requests[other]
+
+            stamps = self._requests.setdefault(key, deque())
+            if len(stamps) >= self.max_requests:
+                self.rejected += 1
+                return self.window - (now - stamps[0])
+            stamps.append(now)
+            return 0.0
+
+    def stats(self) -> dict:
+        """Aktive Sitzungen und abgelehnte Anfragen."""
+        with self._lock:
+            return {"sessions": len(self._requests), "rejected": self.rejected}
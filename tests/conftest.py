@@ -0,0 +1,71 @@
+import pytest
+
+
+class FakeClock:
+    """Steuerbare Uhr für TTL- und Zeitfenster-Tests."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Ersetzt `time.time` und `time.monotonic` durch eine FakeClock."""
+    fake = FakeClock()
+    monkeypatch.setattr("time.time", fake)
+    monkeypatch.setattr("time.monotonic", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(tmp_path, monkeypatch):
+    """Keine Caches oder Verläufe im Home-Verzeichnis anlegen."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TEMPLATE_CACHE_DIR", str(tmp_path / "jinja"))
+
+
+def render_agent_file(path, description="Test-Agent", **settings):
+    """Rendere einen Agent (ohne LLM-Aufruf) nach `path`."""
+    from generator import AgentGenerator, AgentSettings
+    from prompt_cache import PromptCache
+
+    generator = AgentGenerator(prompt_cache=PromptCache(path=None))
+    path.write_text(
+        generator._render_agent(
+            description,
+            f"Du bist ein {description}.",
+            AgentSettings(filename=path.name, **settings),
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture(scope="session")
+def agent_module(tmp_path_factory):
+    """Ein aus dem Standard-Template gerenderter und importierter Agent."""
+    from benchmarks.utils import load_agent_module
+
+    directory = tmp_path_factory.mktemp("agent")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("TEMPLATE_CACHE_DIR", str(directory / "jinja"))
+        path = render_agent_file(directory / "test_agent.py")
+    return load_agent_module(path)
+
+
+@pytest.fixture
+def render_agent(tmp_path):
+    """Rendert Agenten in ein eigenes Verzeichnis: `render_agent("name", **settings)`."""
+    directory = tmp_path / "agents"
+    directory.mkdir()
+
+    def render(name="agent", description="Test-Agent", **settings):
+        return render_agent_file(directory / f"{name}.py", description, **settings)
+
+    return render
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_rejects_with_429_when_queue_is_full(agent_module):
+    admission = agent_module.AdmissionControl(
+        max_in_flight=1, max_queue=1, queue_timeout=5
+    )
+
+    async def scenario():
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        assert admission.stats()["waiting"] == 1
+
+        with pytest.raises(agent_module.AdmissionRejected) as rejected:
+            await admission.acquire()
+        assert rejected.value.status_code == 429
+
+        admission.release()
+        await waiter
+        admission.release()
+
+    run(scenario())
+    assert admission.stats() == {
+        "in_flight": 0,
+        "max_in_flight": 1,
+        "waiting": 0,
+        "max_waiting": 1,
+        "max_queue": 1,
+        "admitted": 2,
+        "rejected_queue_full": 1,
+        "rejected_timeout": 0,
+    }
+
+
+def test_rejects_with_503_after_queue_timeout(agent_module):
+    admission = agent_module.AdmissionControl(
+        max_in_flight=1, max_queue=4, queue_timeout=0.01
+    )
+
+    async def scenario():
+        async with admission.slot():
+            with pytest.raises(agent_module.AdmissionRejected) as rejected:
+                await admission.acquire()
+            assert rejected.value.status_code == 503
+
+    run(scenario())
+    stats = admission.stats()
+    assert (stats["in_flight"], stats["waiting"]) == (0, 0)
+    assert (stats["admitted"], stats["rejected_timeout"]) == (1, 1)
+
+
+def test_slot_is_released_on_error(agent_module):
+    admission = agent_module.AdmissionControl(
+        max_in_flight=1, max_queue=0, queue_timeout=0.01
+    )
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with admission.slot():
+                raise RuntimeError("LLM-Fehler")
+        # Der Platz ist wieder frei
+        async with admission.slot():
+            pass
+
+    run(scenario())
+    assert admission.stats()["in_flight"] == 0
+
+
+def test_zero_means_unlimited(agent_module):
+    admission = agent_module.AdmissionControl(max_in_flight=0, max_queue=0)
+
+    async def scenario():
+        for _ in range(50):
+            await admission.acquire()
+        assert admission.stats()["in_flight"] == 50
+        for _ in range(50):
+            admission.release()
+
+    run(scenario())
+    assert admission.stats()["rejected_queue_full"] == 0
+
+
+def test_a2a_slot_is_held_until_task_finishes(agent_module, monkeypatch):
+    admission = agent_module.AdmissionControl(max_in_flight=2, max_queue=0)
+    monkeypatch.setattr(agent_module, "admission", admission)
+
+    async def scenario():
+        await admission.acquire()
+        ticket = {"handed_off": False}
+        token = agent_module._admission_ticket.set(ticket)
+        try:
+            agent_module.hand_off_admission("task-1")
+        finally:
+            agent_module._admission_ticket.reset(token)
+
+        # Die Anfrage ist beendet, der Platz gehört jetzt der Aufgabe
+        assert ticket["handed_off"]
+        assert admission.stats()["in_flight"] == 1
+
+        agent_module.release_task_admission("task-1")
+        assert admission.stats()["in_flight"] == 0
+        # Doppeltes Freigeben hat keine Wirkung
+        agent_module.release_task_admission("task-1")
+        assert admission.stats()["in_flight"] == 0
+
+    run(scenario())
+
+
+def test_hand_off_without_request_ticket_is_ignored(agent_module):
+    agent_module.hand_off_admission("task-2")
+    assert "task-2" not in agent_module._admitted_tasks
@@ -0,0 +1,71 @@
+import json
+
+import httpx
+
+from benchmarks.mock_llm import MockLLMServer
+from generator import AGENT_REQUIREMENTS, AgentGenerator
+from host import read_agent_definition
+from main import load_batch_items
+from prompt_cache import PromptCache
+
+
+def test_load_batch_items_from_jsonl(tmp_path):
+    path = tmp_path / "agents.jsonl"
+    lines = [
+        json.dumps("Ein Übersetzer"),
+        "",
+        json.dumps({"description": "Ein Korrektor", "use_mcp": True}),
+        json.dumps({"description": "  "}),
+    ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    assert load_batch_items(path) == [
+        {"description": "Ein Übersetzer"},
+        {"description": "Ein Korrektor", "use_mcp": True},
+    ]
+
+
+def test_load_batch_items_from_csv(tmp_path):
+    path = tmp_path / "agents.csv"
+    path.write_text(
+        "description,filename,use_mcp\nEin Übersetzer,ue.py,ja\nEin Korrektor,,0\n",
+        encoding="utf-8",
+    )
+
+    items = load_batch_items(path)
+    assert [item["use_mcp"] for item in items] == [True, False]
+    assert items[0]["filename"] == "ue.py"
+
+
+def test_batch_shares_duplicate_prompts_and_writes_files(tmp_path):
+    items = [
+        {"description": "Ein Übersetzer", "filename": "agent.py"},
+        {"description": "ein  übersetzer", "filename": "agent.py"},
+        {"description": "Ein Korrektor", "template_name": "unbekannt"},
+    ]
+    generator = AgentGenerator(prompt_cache=PromptCache(path=None), max_concurrency=4)
+    try:
+        with MockLLMServer(latency=0.05, response_tokens=8) as mock:
+            results = generator.generate_batch(
+                items,
+                tmp_path,
+                concurrency=4,
+                llm_endpoint=mock.base_url,
+                llm_model="mock",
+            )
+            requests = httpx.get(f"{mock.url}/stats").json()["requests"]
+    finally:
+        generator.close()
+
+    assert [(r.filename, r.status) for r in results] == [
+        ("agent.py", "ok"),
+        ("agent_2.py", "ok"),
+        ("agent_003.py", "error"),
+    ]
+    # Gleiche Beschreibung (nach Normalisierung) = ein Prompt-Engineer-Aufruf
+    assert requests == 2
+    first, second = (
+        read_agent_definition(tmp_path / f) for f in ("agent.py", "agent_2.py")
+    )
+    assert first["system_prompt"] == second["system_prompt"]
+    assert (tmp_path / "requirements.txt").read_text() == AGENT_REQUIREMENTS
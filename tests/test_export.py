@@ -0,0 +1,84 @@
+import zipfile
+
+import pytest
+
+from export import AgentExporter, atomic_write, normalize_filename, render_dockerfile
+from generator import AGENT_REQUIREMENTS
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("mein agent", "mein_agent.py"),
+        ("../../etc/passwd.py", "passwd.py"),
+        ("  ", "mein_agent.py"),
+        ("übersetzer.py", "übersetzer.py"),
+    ],
+)
+def test_normalize_filename(filename, expected):
+    assert normalize_filename(filename) == expected
+
+
+def test_sessions_export_to_separate_directories(tmp_path):
+    exporter = AgentExporter(tmp_path)
+    first = exporter.export("print(1)\n", "agent.py", "session-a")
+    second = exporter.export("print(2)\n", "agent.py", "session-b")
+
+    assert first.agent_path != second.agent_path
+    assert first.agent_path.read_text() == "print(1)\n"
+    assert second.agent_path.read_text() == "print(2)\n"
+    assert first.requirements_path.read_text() == AGENT_REQUIREMENTS
+
+
+def test_session_id_cannot_escape_root(tmp_path):
+    result = AgentExporter(tmp_path / "exports").export("x = 1\n", "a.py", "../../x")
+    assert result.agent_path.resolve().is_relative_to(tmp_path / "exports")
+
+
+def test_bundle_contains_agent_requirements_and_dockerfile(tmp_path):
+    result = AgentExporter(tmp_path).export(
+        "x = 1\n", "agent.py", "s", template_name="server", bundle=True
+    )
+
+    assert result.agent_path is None
+    with zipfile.ZipFile(result.bundle_path) as bundle:
+        assert sorted(bundle.namelist()) == [
+            "Dockerfile",
+            "agent.py",
+            "requirements.txt",
+        ]
+        assert bundle.read("agent.py") == b"x = 1\n"
+        assert bundle.read("Dockerfile").decode() == render_dockerfile(
+            "agent.py", "server"
+        )
+
+
+@pytest.mark.parametrize(
+    "template_name, command",
+    [
+        ("standard", '["python", "a.py", "server"]'),
+        ("server", '["python", "a.py"]'),
+        ("cli", '["python", "a.py"]'),
+    ],
+)
+def test_dockerfile_starts_the_right_mode(template_name, command):
+    dockerfile = render_dockerfile("a.py", template_name)
+    assert dockerfile.endswith(f"CMD {command}\n")
+    assert ("EXPOSE 8000" in dockerfile) == (template_name != "cli")
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "agent.py"
+    atomic_write(path, "alt")
+
+    with pytest.raises(TypeError):
+        atomic_write(path, 42)
+    assert path.read_text() == "alt"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_cleanup_removes_session_directory(tmp_path):
+    exporter = AgentExporter(tmp_path)
+    exporter.export("x = 1\n", "a.py", "s")
+    exporter.cleanup("s")
+    assert not (tmp_path / "s").exists()
@@ -0,0 +1,141 @@
+import asyncio
+from importlib.metadata import version
+
+import pytest
+from packaging.requirements import Requirement
+
+from benchmarks.mock_llm import MockLLMServer
+from benchmarks.utils import load_agent_module
+from generator import (
+    AGENT_REQUIREMENTS,
+    DEFAULT_HTTP_SETTINGS,
+    AgentGenerator,
+    resolve_http_settings,
+)
+from history import GenerationHistory
+from host import read_agent_definition
+from prompt_cache import PromptCache
+
+
+@pytest.fixture
+def generator():
+    generator = AgentGenerator(
+        prompt_cache=PromptCache(path=None), history=GenerationHistory()
+    )
+    yield generator
+    generator.close()
+
+
+def system_prompt_of(code: str, tmp_path) -> str:
+    path = tmp_path / "agent.py"
+    path.write_text(code, encoding="utf-8")
+    return read_agent_definition(path)["system_prompt"]
+
+
+def stream(generator, description, **settings):
+    async def collect():
+        return [code async for code in generator.astream_agent(description, **settings)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_empty_completion_falls_back_without_caching(generator, streaming, tmp_path):
+    with MockLLMServer(latency=0, response_tokens=0) as mock:
+        settings = {"llm_endpoint": mock.base_url, "llm_model": "mock"}
+        if streaming:
+            code = stream(generator, "Ein Übersetzer", **settings)[-1]
+        else:
+            code = generator.generate_agent("Ein Übersetzer", **settings)
+
+    fallback = generator._fallback_system_prompt("Ein Übersetzer")
+    assert system_prompt_of(code, tmp_path) == fallback
+    assert generator.prompt_cache.stats()["memory_entries"] == 0
+    assert generator.history.recent() == []
+
+
+def test_generated_prompt_is_cached_and_recorded(generator):
+    with MockLLMServer(latency=0, response_tokens=8) as mock:
+        settings = {"llm_endpoint": mock.base_url, "llm_model": "mock"}
+        stream(generator, "Ein Übersetzer", **settings)
+        stream(generator, "Ein Übersetzer", **settings)
+
+    assert generator.prompt_cache.stats()["hits"] == 1
+    assert len(generator.history.recent()) == 2
+
+
+def test_rerender_keeps_prompt_and_applies_changes(generator, tmp_path):
+    with MockLLMServer(latency=0, response_tokens=8) as mock:
+        generator.generate_agent(
+            "Ein Übersetzer", llm_endpoint=mock.base_url, llm_model="mock"
+        )
+
+    entry = generator.history.recent()[0]
+    code, new_id = generator.rerender_agent(entry["id"], template_name="server")
+
+    assert system_prompt_of(code, tmp_path) == entry["system_prompt"]
+    assert "def run_interactive" not in code
+    assert generator.history.get(new_id)["settings"]["template_name"] == "server"
+
+
+def test_installed_versions_match_agent_requirements():
+    # Die Tests laufen gegen dieselben Versionen, die generierte Agenten bekommen
+    for line in AGENT_REQUIREMENTS.splitlines()[1:]:
+        requirement = Requirement(line)
+        if requirement.name in ("pydantic-ai-slim", "fasta2a"):
+            assert requirement.specifier.contains(version(requirement.name)), line
+
+
+def test_cleared_http_fields_keep_defaults(generator, tmp_path):
+    with MockLLMServer(latency=0, response_tokens=8) as mock:
+        generator.generate_agent(
+            "Ein Übersetzer", llm_endpoint=mock.base_url, llm_model="mock"
+        )
+
+    # Wie aus der UI: geleerte Zahlenfelder kommen als None, Zahlen als float
+    http_values = [None, 8.0, 30.0, False, None, 60, None, None]
+    code, _ = generator.rerender_agent(
+        generator.history.recent()[0]["id"],
+        http_settings=dict(zip(DEFAULT_HTTP_SETTINGS, http_values)),
+    )
+    path = tmp_path / "agent.py"
+    path.write_text(code, encoding="utf-8")
+
+    assert load_agent_module(path).HTTP_SETTINGS == {
+        **DEFAULT_HTTP_SETTINGS,
+        "max_keepalive_connections": 8,
+        "read_timeout": 60.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "http_settings, error",
+    [
+        ({"max_connections": 2.5}, ValueError),
+        ({"max_connections": -1}, ValueError),
+        ({"max_connections": "32"}, TypeError),
+        ({"http2": 1}, TypeError),
+        ({"pool_size": 4}, ValueError),
+    ],
+)
+def test_invalid_http_settings_are_rejected(http_settings, error):
+    with pytest.raises(error):
+        resolve_http_settings(http_settings)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        # Früher: generate_agent(description, use_mcp, llm_endpoint, ...)
+        lambda generator: generator.generate_agent("Ein Übersetzer", True),
+        lambda generator: generator.generate_agent("Ein Übersetzer", unknown=True),
+        lambda generator: asyncio.run(
+            generator.agenerate_agent("Ein Übersetzer", "sk-key")
+        ),
+        lambda generator: stream(generator, "Ein Übersetzer", unknown=True),
+    ],
+)
+def test_invalid_arguments_fail_before_llm_call(generator, call):
+    with pytest.raises(TypeError):
+        call(generator)
+    assert generator.prompt_cache.stats()["misses"] == 0
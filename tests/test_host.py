@@ -0,0 +1,61 @@
+import time
+
+import httpx
+
+from benchmarks.mock_llm import MockLLMServer
+from benchmarks.utils import ThreadedServer
+from host import create_host_app, defines_create_app, discover_agents
+from llm_pool import LLMPool
+
+
+def send_task(url: str, text: str = "Hallo") -> httpx.Response:
+    message = {"role": "user", "parts": [{"type": "text", "text": text}]}
+    return httpx.post(
+        url,
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tasks/send",
+            "params": {"id": f"task-{time.monotonic_ns()}", "message": message},
+        },
+        timeout=30,
+    )
+
+
+def wait_until(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Bedingung nicht rechtzeitig erfüllt"
+        time.sleep(0.01)
+
+
+def test_discovery_skips_files_without_server_mode(render_agent):
+    server = render_agent("server_agent")
+    cli = render_agent("cli_agent", template_name="cli")
+    (server.parent / "notes.py").write_text("x = 1\n", encoding="utf-8")
+
+    assert defines_create_app(server)
+    assert not defines_create_app(cli)
+    assert list(discover_agents(server.parent, LLMPool())) == ["server_agent"]
+
+
+def test_admission_applies_behind_mount(render_agent, monkeypatch):
+    monkeypatch.setenv("AGENT_MAX_IN_FLIGHT", "1")
+    monkeypatch.setenv("AGENT_MAX_QUEUE", "0")
+
+    with MockLLMServer(latency=1.0, response_tokens=4) as mock:
+        path = render_agent("a1", llm_endpoint=mock.base_url, llm_model="mock")
+        app = create_host_app(path.parent, idle_timeout=0)
+        with ThreadedServer(app) as server:
+            statuses = [send_task(f"{server.url}/a1/").status_code for _ in range(4)]
+            assert statuses == [200, 429, 429, 429]
+
+            # Die Aufgabe läuft nach der Antwort weiter und hält den Platz
+            agent = app.state.agents["a1"]
+            wait_until(lambda: agent.in_flight == 0)
+            assert agent.busy
+
+            stats = httpx.get(f"{server.url}/a1/admission/stats").json()
+            assert (stats["admitted"], stats["rejected_queue_full"]) == (1, 3)
+
+            wait_until(lambda: not agent.busy)
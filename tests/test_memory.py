@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from pydantic_ai.messages import (
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import FunctionModel
+
+
+class FakeLLM:
+    """Merkt sich, wie viele Nachrichten jeder Aufruf mitbekommt."""
+
+    def __init__(self, fail_summary: bool = False):
+        self.history_lengths = []
+        self.summaries = 0
+        self.fail_summary = fail_summary
+
+    def respond(self, messages, info):
+        prompt = [
+            part.content
+            for part in messages[-1].parts
+            if isinstance(part, UserPromptPart)
+        ][-1]
+        if prompt.startswith("Fasse das folgende Gespräch"):
+            self.summaries += 1
+            if self.fail_summary:
+                raise RuntimeError("LLM nicht erreichbar")
+            return ModelResponse(parts=[TextPart("Bisher: Begrüßung.")])
+
+        self.history_lengths.append(len(messages))
+        tool = info.output_tools[0].name
+        return ModelResponse(
+            parts=[ToolCallPart(tool, {"response": f"Antwort auf {prompt}"})]
+        )
+
+
+@pytest.fixture
+def agent(agent_module, monkeypatch):
+    monkeypatch.setattr(
+        agent_module, "admission", agent_module.AdmissionControl(max_in_flight=0)
+    )
+    return agent_module
+
+
+@pytest.fixture
+def use(agent, monkeypatch):
+    """Setze LLM und Gesprächsspeicher für einen Test (danach zurückgesetzt)."""
+
+    def use(llm: FakeLLM, **memory_settings) -> FakeLLM:
+        memory = agent.ConversationMemory(**memory_settings)
+        monkeypatch.setattr(agent, "memory", memory)
+        monkeypatch.setattr(
+            agent, "_agent", agent.create_agent(model=FunctionModel(llm.respond))
+        )
+        return llm
+
+    return use
+
+
+def converse(agent, turns: list[tuple[str, str]]):
+    async def scenario():
+        return [
+            await agent.run_agent_output(text, session_id=session)
+            for session, text in turns
+        ]
+
+    return asyncio.run(scenario())
+
+
+def test_sessions_keep_their_own_history(agent, use):
+    llm = use(FakeLLM())
+    converse(agent, [("a", "Hallo"), ("b", "Hi"), ("a", "Und jetzt?")])
+
+    # Zweite Runde von "a" sieht die erste (Anfrage + Antwort + Tool-Rückgabe)
+    assert llm.history_lengths[0] == llm.history_lengths[1] == 1
+    assert llm.history_lengths[2] > 1
+    assert agent.memory.stats()["sessions"] == 2
+
+
+def test_history_over_budget_is_summarized(agent, use):
+    llm = use(FakeLLM(), max_tokens=60, keep_turns=1)
+    long_text = "Ein langer Absatz. " * 10
+    converse(agent, [("a", f"{long_text}{i}") for i in range(3)])
+
+    assert llm.summaries >= 1
+    assert agent.memory.stats()["summaries"] == llm.summaries
+
+    session = agent.memory._sessions["a"]
+    first = session.messages[0].parts
+    assert isinstance(first[0], SystemPromptPart)
+    assert first[0].content == agent.AGENT_DEFINITION["system_prompt"]
+    assert first[1].content.endswith("Bisher: Begrüßung.")
+
+
+def test_failed_summary_drops_older_turns(agent, use):
+    use(FakeLLM(fail_summary=True), max_tokens=60, keep_turns=1)
+    long_text = "Ein langer Absatz. " * 10
+    converse(agent, [("a", f"{long_text}{i}") for i in range(3)])
+
+    session = agent.memory._sessions["a"]
+    prompts = [
+        part.content
+        for message in session.messages
+        for part in message.parts
+        if isinstance(part, UserPromptPart)
+    ]
+    assert prompts == [f"{long_text}2"]
+    assert isinstance(session.messages[0].parts[0], SystemPromptPart)
+    assert agent.memory.stats()["summaries"] == 0
+
+
+def test_least_recently_used_session_is_evicted(agent, use):
+    use(FakeLLM(), max_sessions=2)
+    converse(agent, [("a", "1"), ("b", "2"), ("a", "3"), ("c", "4")])
+
+    assert set(agent.memory._sessions) == {"a", "c"}
+    assert agent.memory.stats()["evictions"] == 1
+
+
+def test_returning_session_at_capacity_keeps_history(agent, use):
+    llm = use(FakeLLM(), max_sessions=2)
+    converse(agent, [("a", "1"), ("b", "2"), ("a", "3")])
+
+    assert llm.history_lengths[2] > 1
+    assert agent.memory.stats()["evictions"] == 0
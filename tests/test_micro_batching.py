@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from pydantic_ai.messages import ModelResponse, ToolCallPart, UserPromptPart
+from pydantic_ai.models.function import FunctionModel
+
+from benchmarks.utils import load_agent_module
+
+
+class FakeLLM:
+    """Beantwortet Batch-Prompts mit einer Liste, Einzelanfragen direkt."""
+
+    def __init__(self, drop_answers: int = 0):
+        self.calls = []
+        self.drop_answers = drop_answers
+
+    def respond(self, messages, info):
+        prompt = next(
+            part.content
+            for part in messages[-1].parts
+            if isinstance(part, UserPromptPart)
+        )
+        self.calls.append(prompt)
+        tool = info.output_tools[0].name
+        if "unabhängig voneinander" in prompt:
+            inputs = json.loads(prompt.split("\n\n", 1)[1])
+            answers = [{"response": f"Antwort: {text}"} for text in inputs]
+            args = {"response": answers[self.drop_answers :]}
+        else:
+            args = {"response": f"Antwort: {prompt}"}
+        return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+
+@pytest.fixture
+def batching_agent(render_agent, monkeypatch):
+    module = load_agent_module(render_agent(micro_batching=True))
+    monkeypatch.setattr(
+        module, "batcher", module.MicroBatcher(window=0.01, max_batch_size=4)
+    )
+    monkeypatch.setattr(
+        module, "admission", module.AdmissionControl(max_in_flight=0, max_queue=0)
+    )
+    return module
+
+
+def use_llm(module, llm: FakeLLM) -> FakeLLM:
+    module._agent = module.create_agent(model=FunctionModel(llm.respond))
+    return llm
+
+
+def ask_concurrently(module, inputs: list[str]) -> list:
+    async def scenario():
+        return await asyncio.gather(
+            *(module.run_agent_output(text) for text in inputs),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_one_llm_call(batching_agent):
+    llm = use_llm(batching_agent, FakeLLM())
+    outputs = ask_concurrently(batching_agent, ["eins", "zwei", "drei"])
+
+    assert [o.response for o in outputs] == [
+        "Antwort: eins",
+        "Antwort: zwei",
+        "Antwort: drei",
+    ]
+    assert len(llm.calls) == 1
+    stats = batching_agent.batcher.stats()
+    assert (stats["batches"], stats["avg_batch_size"]) == (1, 3)
+
+
+def test_full_batch_is_flushed_without_waiting(batching_agent):
+    llm = use_llm(batching_agent, FakeLLM())
+    outputs = ask_concurrently(batching_agent, [str(i) for i in range(6)])
+
+    assert [o.response for o in outputs] == [f"Antwort: {i}" for i in range(6)]
+    # max_batch_size=4: ein voller Batch und ein Rest
+    assert len(llm.calls) == 2
+    assert batching_agent.batcher.stats()["batched_requests"] == 6
+
+
+def test_wrong_answer_count_falls_back_to_single_requests(batching_agent):
+    llm = use_llm(batching_agent, FakeLLM(drop_answers=1))
+    outputs = ask_concurrently(batching_agent, ["eins", "zwei", "drei"])
+
+    assert [o.response for o in outputs] == [
+        "Antwort: eins",
+        "Antwort: zwei",
+        "Antwort: drei",
+    ]
+    assert llm.calls[1:] == ["eins", "zwei", "drei"]
+    assert batching_agent.batcher.stats()["fallbacks"] == 1
+
+
+def test_fallback_stays_in_the_batch_admission_slot(batching_agent, monkeypatch):
+    admission = batching_agent.AdmissionControl(max_in_flight=1, max_queue=0)
+    monkeypatch.setattr(batching_agent, "admission", admission)
+    use_llm(batching_agent, FakeLLM(drop_answers=1))
+
+    outputs = ask_concurrently(batching_agent, ["eins", "zwei", "drei"])
+
+    assert not [o for o in outputs if isinstance(o, Exception)]
+    assert admission.stats()["admitted"] == 1
+    assert admission.stats()["in_flight"] == 0
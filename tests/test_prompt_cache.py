@@ -0,0 +1,112 @@
+from prompt_cache import PromptCache
+
+
+def test_make_key_normalizes_description():
+    key = PromptCache.make_key("Ein  Übersetzer\n", "prompt", "model")
+    assert key == PromptCache.make_key("ein übersetzer", "prompt", "model")
+    assert key != PromptCache.make_key("ein übersetzer", "prompt", "other-model")
+
+
+def test_memory_entry_expires_after_ttl(clock):
+    cache = PromptCache(path=None, ttl=60)
+    cache.set("key", "value")
+
+    clock.advance(60)
+    assert cache.get("key") == "value"
+
+    clock.advance(1)
+    assert cache.get("key") is None
+    assert cache.stats()["memory_entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = PromptCache(path=None, max_memory_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "a" ist jetzt jünger als "b"
+
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "prompts.sqlite"
+    PromptCache(path=path).set("key", "value")
+
+    cache = PromptCache(path=path)
+    assert cache.get("key") == "value"
+    assert cache.disk_hits == 1
+    # Danach aus dem Speicher
+    assert cache.get("key") == "value"
+    assert cache.memory_hits == 1
+
+
+def test_disk_entry_expires_after_ttl(tmp_path, clock):
+    path = tmp_path / "prompts.sqlite"
+    PromptCache(path=path, ttl=60).set("key", "value")
+
+    clock.advance(61)
+    cache = PromptCache(path=path, ttl=60)
+    assert cache.get("key") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_disk_evicts_least_recently_accessed(tmp_path, clock):
+    cache = PromptCache(
+        path=tmp_path / "prompts.sqlite", max_memory_entries=1, max_disk_entries=2
+    )
+    cache.set("a", "1")
+    clock.advance(1)
+    cache.set("b", "2")
+    clock.advance(1)
+    # Zugriff von der Platte ("a" ist nicht mehr im Speicher) frischt "a" auf
+    assert cache.get("a") == "1"
+    clock.advance(1)
+
+    cache.set("c", "3")
+    assert cache.stats()["disk_entries"] == 2
+
+    fresh = PromptCache(path=tmp_path / "prompts.sqlite")
+    assert fresh.get("b") is None
+    assert fresh.get("a") == "1"
+    assert fresh.get("c") == "3"
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = PromptCache(path=tmp_path / "prompts.sqlite")
+    cache.set("key", "value")
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_memory_hits_keep_disk_entry_fresh(tmp_path, clock):
+    path = tmp_path / "prompts.sqlite"
+    cache = PromptCache(path=path, max_memory_entries=2, max_disk_entries=2)
+    cache.set("a", "1")
+    clock.advance(1)
+    cache.set("b", "2")
+    clock.advance(1)
+    # Treffer aus dem Speicher zählt auch für die Verdrängung auf der Platte
+    assert cache.get("a") == "1"
+    assert cache.memory_hits == 1
+    clock.advance(1)
+
+    cache.set("c", "3")
+    fresh = PromptCache(path=path)
+    assert fresh.get("a") == "1"
+    assert fresh.get("b") is None
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("PROMPT_CACHE_PATH", "off")
+    monkeypatch.setenv("PROMPT_CACHE_TTL", "60")
+    cache = PromptCache.from_env()
+    assert (cache.ttl, cache.stats()["disk_entries"]) == (60.0, 0)
+
+    monkeypatch.delenv("PROMPT_CACHE_TTL")
+    assert PromptCache.from_env().ttl == 7 * 24 * 3600
@@ -0,0 +1,56 @@
+import pytest
+
+from rate_limit import SessionRateLimiter
+
+
+def test_rejects_beyond_limit_within_window(clock):
+    limiter = SessionRateLimiter(max_requests=2, window=60)
+    assert limiter.acquire("a") == 0
+    clock.advance(10)
+    assert limiter.acquire("a") == 0
+
+    clock.advance(10)
+    # Die älteste Anfrage fällt nach 60 s aus dem Fenster, also in 40 s
+    assert limiter.acquire("a") == pytest.approx(40)
+    assert limiter.stats() == {"sessions": 1, "rejected": 1}
+
+
+def test_window_slides(clock):
+    limiter = SessionRateLimiter(max_requests=2, window=60)
+    limiter.acquire("a")
+    clock.advance(30)
+    limiter.acquire("a")
+
+    clock.advance(30)
+    # Erste Anfrage ist genau aus dem Fenster gefallen, die zweite noch nicht
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == pytest.approx(30)
+
+
+def test_sessions_are_limited_independently(clock):
+    limiter = SessionRateLimiter(max_requests=1, window=60)
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("b") == 0
+    assert limiter.acquire("a") > 0
+    assert limiter.stats()["sessions"] == 2
+
+
+def test_idle_sessions_are_dropped(clock):
+    limiter = SessionRateLimiter(max_requests=1, window=60)
+    limiter.acquire("a")
+    clock.advance(61)
+    limiter.acquire("b")
+    assert limiter.stats()["sessions"] == 1
+
+
+def test_zero_disables_limit():
+    limiter = SessionRateLimiter(max_requests=0, window=60)
+    assert all(limiter.acquire("a") == 0 for _ in range(100))
+    assert limiter.stats()["rejected"] == 0
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("GRADIO_RATE_LIMIT", "3")
+    monkeypatch.setenv("GRADIO_RATE_WINDOW", "5")
+    limiter = SessionRateLimiter.from_env()
+    assert (limiter.max_requests, limiter.window) == (3, 5.0)
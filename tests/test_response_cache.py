@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks.utils import load_agent_module
+
+
+@pytest.fixture
+def cached_agent(render_agent):
+    return load_agent_module(render_agent(response_cache=True))
+
+
+def test_key_keeps_case_and_normalizes_whitespace(cached_agent):
+    cache = cached_agent.ResponseCache()
+    key = cache.make_key("Hallo Welt")
+
+    assert key == cache.make_key("  Hallo\n Welt ")
+    assert key != cache.make_key("hallo welt")
+
+
+def test_entries_expire_after_ttl(cached_agent, clock):
+    cache = cached_agent.ResponseCache(ttl=60)
+    cache.set("key", "value")
+
+    clock.advance(60)
+    assert cache.get("key") == "value"
+    clock.advance(1)
+    assert cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_disk_backend_survives_restart(cached_agent, tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cached_agent.ResponseCache(path=path).set("key", "value")
+
+    assert cached_agent.ResponseCache(path=path).get("key") == "value"
+
+
+@pytest.mark.parametrize(
+    "variable, value",
+    [("AGENT_LLM_MODEL", "other-model"), ("AGENT_LLM_ENDPOINT", "http://mock/v1")],
+)
+def test_key_follows_model_in_use(cached_agent, monkeypatch, variable, value):
+    cache = cached_agent.ResponseCache()
+    key = cache.make_key("Hallo Welt")
+
+    monkeypatch.setenv(variable, value)
+    monkeypatch.setattr(cached_agent, "_agent", None)
+    assert cache.make_key("Hallo Welt") != key